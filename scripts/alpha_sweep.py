@@ -18,9 +18,15 @@ Usage:
 """
 
 import argparse
+import atexit
 import json
+import multiprocessing
+import os
+import signal
 import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
@@ -109,34 +115,152 @@ def load_checkpoint():
     return {}
 
 def save_checkpoint(checkpoint):
-    """Save progress to checkpoint file."""
+    """Save progress to checkpoint file.
+
+    Written to a temp file and atomically renamed into place, so a
+    crash mid-dump can never leave a truncated checkpoint behind (which
+    would silently discard all recorded progress on the next --resume).
+    """
+    tmp_file = CHECKPOINT_FILE + '.tmp'
     try:
-        with open(CHECKPOINT_FILE, 'w') as f:
+        with open(tmp_file, 'w') as f:
             json.dump(checkpoint, indent=2, fp=f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, CHECKPOINT_FILE)
         log(f"Checkpoint saved to {CHECKPOINT_FILE}")
     except Exception as e:
         log(f"Error saving checkpoint: {e}", 'ERROR')
 
-def validate_hdf5(filepath):
-    """Check if HDF5 file is valid and contains data."""
+class CheckpointWriter:
+    """Batches checkpoint flushes instead of fsyncing after every event.
+
+    Each save_checkpoint call re-serializes and fsyncs the whole dict;
+    when many short simulations complete in a burst (parallel runs on
+    small grids) that becomes pure write amplification. mark_dirty()
+    flushes only every 5 completions or 30 seconds, and an atexit hook
+    plus a SIGTERM handler flush whatever is pending on shutdown.
+    """
+
+    FLUSH_EVERY = 5
+    FLUSH_SECONDS = 30.0
+
+    def __init__(self, checkpoint):
+        self.checkpoint = checkpoint
+        self._dirty = False
+        self._completions = 0
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+        try:
+            signal.signal(signal.SIGTERM, self._on_sigterm)
+        except ValueError:
+            pass  # not the main thread; atexit still covers us
+
+    def mark_dirty(self):
+        self._dirty = True
+        self._completions += 1
+        if (self._completions % self.FLUSH_EVERY == 0
+                or time.monotonic() - self._last_flush > self.FLUSH_SECONDS):
+            self.flush()
+
+    def flush(self):
+        if self._dirty:
+            save_checkpoint(self.checkpoint)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    def _on_sigterm(self, signum, frame):
+        self.flush()
+        sys.exit(128 + signum)
+
+# Successful validations memoized on (path, mtime_ns, size) -> n_systems
+_validation_cache = {}
+
+def validate_hdf5(filepath, checkpoint=None):
+    """Check if HDF5 file is valid and contains data.
+
+    Row count and column names come from store metadata (the table
+    schema, or the fixed-format axis arrays), so multi-GB files
+    validate without materializing any row data. Falls back to a full
+    read only if the metadata layout is not recognized.
+
+    Successful validations are memoized on (path, mtime, size), both
+    in process (so the pre-scan and post-simulation checks share one
+    file open per invocation) and, when a checkpoint dict is given,
+    persisted so resumed sweeps stat the files instead of re-opening
+    them. Stale files re-check automatically because the key changes.
+    """
+    required_cols = ['M1_initial', 'M2_initial', 'P_initial', 'Z']
+
+    file_stat = None
+    cache_key = None
     try:
-        df = pd.read_hdf(filepath, 'results')
-        
+        file_stat = os.stat(filepath)
+    except OSError:
+        pass
+    else:
+        cache_key = (str(filepath), file_stat.st_mtime_ns, file_stat.st_size)
+        cached = _validation_cache.get(cache_key)
+        if cached is None and checkpoint is not None:
+            entry = checkpoint.get('validated_files', {}).get(str(filepath))
+            if (entry and entry.get('mtime') == file_stat.st_mtime
+                    and entry.get('size') == file_stat.st_size):
+                cached = entry['n_systems']
+        if cached is not None:
+            log(f"File {filepath} validated (cached): {cached} systems")
+            _validation_cache[cache_key] = cached
+            return True
+
+    # Truncated or non-HDF5 files fail on the 8-byte magic, without
+    # paying for a PyTables open and the exception it would raise
+    try:
+        with open(filepath, 'rb') as f:
+            if f.read(8) != b'\x89HDF\r\n\x1a\n':
+                log(f"File {filepath} is not a valid HDF5 container", 'WARNING')
+                return False
+    except OSError as e:
+        log(f"Error validating {filepath}: {e}", 'ERROR')
+        return False
+
+    try:
+        try:
+            with pd.HDFStore(filepath, mode='r') as store:
+                storer = store.get_storer('results')
+                if storer.is_table:
+                    n_rows = int(storer.nrows)
+                    columns = list(storer.non_index_axes[0][1])
+                else:
+                    group = storer.group
+                    n_rows = int(group.axis1.shape[0])
+                    columns = [c.decode() if isinstance(c, bytes) else str(c)
+                               for c in group.axis0[:]]
+        except Exception:
+            df = pd.read_hdf(filepath, 'results')
+            n_rows = len(df)
+            columns = df.columns
+
         # Check if file has data
-        if len(df) == 0:
+        if n_rows == 0:
             log(f"File {filepath} is empty", 'WARNING')
             return False
-        
+
         # Check for required columns
-        required_cols = ['M1_initial', 'M2_initial', 'P_initial', 'Z']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = [col for col in required_cols if col not in columns]
         if missing_cols:
             log(f"File {filepath} missing columns: {missing_cols}", 'WARNING')
             return False
-        
-        log(f"File {filepath} validated: {len(df)} systems")
+
+        log(f"File {filepath} validated: {n_rows} systems")
+        if cache_key is not None:
+            _validation_cache[cache_key] = int(n_rows)
+        if checkpoint is not None and file_stat is not None:
+            checkpoint.setdefault('validated_files', {})[str(filepath)] = {
+                'mtime': file_stat.st_mtime,
+                'size': file_stat.st_size,
+                'n_systems': int(n_rows),
+            }
         return True
-        
+
     except Exception as e:
         log(f"Error validating {filepath}: {e}", 'ERROR')
         return False
@@ -166,71 +290,111 @@ def check_prerequisites():
 # Simulation Runner
 # ============================================================================
 
-def build_command(sim_config):
-    """Build the command to run a simulation."""
-    cmd = [
-        'python', 'run_population.py',
-        '--metallicity', str(sim_config['metallicity']),
-        '--alpha_CE', str(sim_config['alpha_CE']),
-        '--n_systems', str(sim_config['n_systems']),
-        '--output', sim_config['output']
-    ]
-    
-    # Add parameter ranges
-    for key, value in sim_config['params'].items():
-        cmd.extend([f'--{key}', str(value)])
-    
-    return cmd
+# Sweep entries share parameter ranges; identical grids are built once
+# and reused across alpha values
+_grid_cache = {}
+
+# Per-simulation wall-clock limit, matching the 2 h timeout the old
+# subprocess runner enforced
+SIM_TIMEOUT = 2 * 60 * 60  # seconds
+
+# Persistent single worker for the watchdogged serial path. The worker
+# survives across sweep entries, so the grid and joblib step caches in
+# run_simulation keep paying off; only a timeout kill discards them.
+_sim_pool = None
+
 
 def run_simulation(sim_config, dry_run=False):
-    """Run a single simulation with error handling."""
+    """Run a single simulation in-process with error handling.
+
+    Calling run_population directly (instead of shelling out to
+    run_population.py) keeps the sweep in one interpreter, where the
+    joblib step cache in load_steps_cached turns the 2-5 minute POSYDON
+    grid load into a seconds-long reload for every sweep entry after
+    the first at a given alpha.
+    """
     log(f"Starting: {sim_config['name']}")
     log(f"  Metallicity: {sim_config['metallicity']}")
     log(f"  Alpha CE: {sim_config['alpha_CE']}")
     log(f"  Output: {sim_config['output']}")
     log(f"  Systems: {sim_config['n_systems']}")
-    
-    cmd = build_command(sim_config)
-    
+
     if dry_run:
-        log(f"DRY RUN - Would execute: {' '.join(cmd)}")
+        log(f"DRY RUN - Would run {sim_config['name']} in-process")
         return True, "Dry run - not executed"
-    
+
     try:
-        start_time = datetime.now()
-        log(f"Command: {' '.join(cmd)}")
-        
-        # Run simulation
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=7200  # 2 hour timeout per simulation
+        # Imported lazily so --dry-run and --analyze-only work on
+        # machines without POSYDON installed
+        from run_population import create_binary_grid, run_population
+
+        # monotonic clock: immune to NTP steps/DST over a ~90 min sim
+        start_time = time.monotonic()
+        p = sim_config['params']
+
+        grid_key = (tuple(sorted(p.items())), sim_config['metallicity'],
+                    sim_config['n_systems'])
+        binary_grid = _grid_cache.get(grid_key)
+        if binary_grid is None:
+            binary_grid = create_binary_grid(
+                M1_range=(p['M1_min'], p['M1_max'], p['M1_samples']),
+                M2_range=(p['M2_min'], p['M2_max'], p['M2_samples']),
+                P_range=(p['P_min'], p['P_max'], p['P_samples']),
+                metallicities=[sim_config['metallicity']],
+                n_samples=sim_config['n_systems']
+            )
+            _grid_cache[grid_key] = binary_grid
+        log(f"Grid: {len(binary_grid)} systems")
+
+        run_population(
+            binary_grid,
+            sim_config['output'],
+            alpha_CE=sim_config['alpha_CE'],
+            verbose=False
         )
-        
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds() / 60
-        
-        if result.returncode == 0:
-            log(f"✓ Simulation completed successfully in {duration:.1f} minutes")
-            
-            # Validate output
-            if validate_hdf5(sim_config['output']):
-                return True, f"Success ({duration:.1f} min)"
-            else:
-                return False, "Output validation failed"
+
+        duration = (time.monotonic() - start_time) / 60
+        log(f"✓ Simulation completed successfully in {duration:.1f} minutes")
+
+        # Validate output
+        if validate_hdf5(sim_config['output']):
+            return True, f"Success ({duration:.1f} min)"
         else:
-            log(f"✗ Simulation failed with return code {result.returncode}", 'ERROR')
-            log(f"stderr: {result.stderr}", 'ERROR')
-            return False, f"Exit code {result.returncode}"
-            
-    except subprocess.TimeoutExpired:
-        log(f"✗ Simulation timed out after 2 hours", 'ERROR')
-        return False, "Timeout"
+            return False, "Output validation failed"
+
     except Exception as e:
-        log(f"✗ Unexpected error: {e}", 'ERROR')
+        log(f"✗ Simulation failed: {e}", 'ERROR')
         return False, str(e)
 
+
+def run_simulation_watchdog(sim_config, dry_run=False):
+    """Run run_simulation under the SIM_TIMEOUT watchdog.
+
+    Runs the simulation in a persistent worker process so a hung POSYDON
+    evolution can be killed after SIM_TIMEOUT, restoring the timeout
+    failure path the old subprocess runner had. Pool workers are daemonic,
+    so even a hung worker cannot keep the sweep alive at exit. Used by
+    the serial loop; --jobs workers call run_simulation directly.
+    """
+    if dry_run:
+        return run_simulation(sim_config, dry_run=True)
+
+    global _sim_pool
+    if _sim_pool is None:
+        _sim_pool = multiprocessing.Pool(processes=1)
+    result = _sim_pool.apply_async(run_simulation, (sim_config,))
+    try:
+        return result.get(timeout=SIM_TIMEOUT)
+    except multiprocessing.TimeoutError:
+        log(f"✗ Timeout after {SIM_TIMEOUT // 60} minutes: "
+            f"{sim_config['name']}", 'ERROR')
+        # Kill the hung worker; the next simulation gets a fresh pool
+        # (and re-warms the caches)
+        _sim_pool.terminate()
+        _sim_pool.join()
+        _sim_pool = None
+        return False, "Timeout"
+
 # ============================================================================
 # Main Orchestrator
 # ============================================================================
@@ -263,7 +427,7 @@ def run_sweep(args):
         
         # Check if already completed
         if output_file.exists():
-            if validate_hdf5(output_file):
+            if validate_hdf5(output_file, checkpoint):
                 log(f"✓ {sim['name']}: Already complete ({sim['output']})")
                 skipped.append(sim)
                 continue
@@ -279,7 +443,11 @@ def run_sweep(args):
                 continue
         
         to_run.append(sim)
-    
+
+    # Persist the validation cache so resumed runs only stat the files
+    if checkpoint.get('validated_files'):
+        save_checkpoint(checkpoint)
+
     # Summary
     log(f"\nSimulation plan:")
     log(f"  To run: {len(to_run)}")
@@ -309,34 +477,70 @@ def run_sweep(args):
     log("STARTING SIMULATIONS")
     log("="*70)
     
-    total_start = datetime.now()
+    total_start = time.monotonic()
     successes = 0
     failures = 0
-    
-    for i, sim in enumerate(to_run, 1):
-        log(f"\n[{i}/{len(to_run)}] {sim['name']}")
-        log("-"*70)
-        
-        success, message = run_simulation(sim, dry_run=args.dry_run)
-        
-        # Update checkpoint
-        checkpoint[sim['name']] = {
-            'status': 'complete' if success else 'failed',
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        }
-        save_checkpoint(checkpoint)
-        
-        if success:
-            successes += 1
-        else:
-            failures += 1
-            if args.stop_on_error:
-                log("\nStopping due to error (--stop-on-error)", 'ERROR')
-                break
+    writer = CheckpointWriter(checkpoint)
+
+    if args.jobs > 1 and len(to_run) > 1:
+        # Simulations are independent, so run several at once; the
+        # checkpoint is only touched from this parent process as each
+        # future completes. No SIM_TIMEOUT watchdog here — the executor
+        # has no public way to kill a single hung worker
+        max_workers = min(args.jobs, len(to_run))
+        log(f"\nRunning up to {max_workers} simulations concurrently (--jobs)")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run_simulation, sim): sim
+                       for sim in to_run}
+            for i, future in enumerate(as_completed(futures), 1):
+                sim = futures[future]
+                try:
+                    success, message = future.result()
+                except Exception as e:
+                    success, message = False, str(e)
+                log(f"\n[{i}/{len(to_run)}] {sim['name']}: {message}")
+
+                checkpoint[sim['name']] = {
+                    'status': 'complete' if success else 'failed',
+                    'message': message,
+                    'timestamp': datetime.now().isoformat()
+                }
+                writer.mark_dirty()
+
+                if success:
+                    successes += 1
+                else:
+                    failures += 1
+                    if args.stop_on_error:
+                        log("\nStopping due to error (--stop-on-error)", 'ERROR')
+                        executor.shutdown(cancel_futures=True)
+                        break
+    else:
+        for i, sim in enumerate(to_run, 1):
+            log(f"\n[{i}/{len(to_run)}] {sim['name']}")
+            log("-"*70)
+
+            success, message = run_simulation_watchdog(sim, dry_run=args.dry_run)
+
+            # Update checkpoint
+            checkpoint[sim['name']] = {
+                'status': 'complete' if success else 'failed',
+                'message': message,
+                'timestamp': datetime.now().isoformat()
+            }
+            writer.mark_dirty()
+
+            if success:
+                successes += 1
+            else:
+                failures += 1
+                if args.stop_on_error:
+                    log("\nStopping due to error (--stop-on-error)", 'ERROR')
+                    break
     
     # Final summary
-    total_time = (datetime.now() - total_start).total_seconds() / 60
+    writer.flush()
+    total_time = (time.monotonic() - total_start) / 60
     
     log("\n" + "="*70)
     log("SIMULATION SWEEP COMPLETE")
@@ -353,27 +557,41 @@ def run_sweep(args):
     return True
 
 def run_analysis():
-    """Run the alpha sweep analysis script."""
+    """Run the alpha sweep analysis script.
+
+    Output streams straight to a log file instead of being buffered in
+    RAM by capture_output, so it can be tail-followed while the
+    analysis runs; on failure only the tail of the log is echoed.
+    """
     log("\n" + "="*70)
     log("RUNNING ANALYSIS")
     log("="*70)
-    
+
+    analysis_log = Path('logs') / 'analyze_alpha_sweep.log'
+    analysis_log.parent.mkdir(exist_ok=True)
+
     try:
-        result = subprocess.run(
-            ['python', 'analyze_alpha_sweep.py'],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        if result.returncode == 0:
+        with open(analysis_log, 'wb') as f:
+            proc = subprocess.Popen(
+                ['python', 'analyze_alpha_sweep.py'],
+                stdout=f, stderr=subprocess.STDOUT
+            )
+            returncode = proc.wait(timeout=300)  # 5 minute timeout
+
+        if returncode == 0:
             log("✓ Analysis completed successfully")
-            print(result.stdout)
+            log(f"Analysis output: {analysis_log}")
             return True
         else:
             log("✗ Analysis failed", 'ERROR')
-            log(result.stderr, 'ERROR')
+            with open(analysis_log, 'rb') as f:
+                f.seek(max(0, analysis_log.stat().st_size - 2048))
+                log(f.read().decode(errors='replace'), 'ERROR')
             return False
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        log("✗ Analysis timed out after 5 minutes", 'ERROR')
+        return False
     except Exception as e:
         log(f"✗ Error running analysis: {e}", 'ERROR')
         return False
@@ -410,6 +628,8 @@ Examples:
                        help='Skip confirmation prompt')
     parser.add_argument('--analyze', action='store_true',
                        help='Run analysis after simulations complete')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Simulations to run concurrently (default: 1)')
     
     args = parser.parse_args()
     
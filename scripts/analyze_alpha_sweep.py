@@ -24,37 +24,86 @@ To generate missing data files, run:
     python run_population.py --metallicity 0.006 --alpha_CE 2.0 --n_systems 200 --output mid_Z_alpha2p0.h5
 """
 
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from scipy.stats import beta
 import sys
+import warnings
 
 # Create output directory
 results_dir = Path('results')
 sensitivity_dir = results_dir / 'sensitivity'
 sensitivity_dir.mkdir(parents=True, exist_ok=True)
 
+# 150 dpi by default; export FIG_DPI=300 for the publication pass
+FIG_DPI = int(os.environ.get('FIG_DPI', '150'))
+
 print("="*70)
 print("PARAMETER SENSITIVITY ANALYSIS - αCE SWEEP")
 print("="*70)
 
+def write_csv(df, path):
+    """Write a summary CSV, using pyarrow's columnar writer when available.
+
+    pyarrow writes straight from columnar buffers; pandas' writer does a
+    per-cell Python str() conversion. Falls back if pyarrow is missing.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except ImportError:
+        df.to_csv(path, index=False)
+
 def wilson_ci(k, n, alpha=0.05):
-    """Wilson score confidence interval for binomial proportion."""
-    if n == 0:
-        return 0.0, 0.0
-    if k == 0:
-        lower = 0.0
-        upper = 1 - alpha**(1/n)
-    elif k == n:
-        lower = alpha**(1/n)
-        upper = 1.0
-    else:
-        lower = beta.ppf(alpha/2, k, n-k+1) if k > 0 else 0.0
-        upper = beta.ppf(1-alpha/2, k+1, n-k) if k < n else 1.0
+    """Wilson score confidence interval for binomial proportion.
+
+    Vectorized: k and n may be scalars or arrays, and beta.ppf is entered
+    once per bound for the whole batch instead of once per group.
+    """
+    k = np.asarray(k, dtype=float)
+    n = np.asarray(n, dtype=float)
+
+    interior = (k > 0) & (k < n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lower = np.where(interior, beta.ppf(alpha/2, k, n-k+1),
+                         np.where(k == 0, 0.0, alpha**(1/n)))
+        upper = np.where(interior, beta.ppf(1-alpha/2, k+1, n-k),
+                         np.where(k == n, 1.0, 1 - alpha**(1/n)))
+
+    # Empty groups have no interval
+    lower = np.where(n == 0, 0.0, lower)
+    upper = np.where(n == 0, 0.0, upper)
+
+    if lower.ndim == 0:
+        return float(lower) * 100, float(upper) * 100
     return lower * 100, upper * 100
 
+# Only the columns the sweep statistics actually touch
+SWEEP_COLUMNS = ['CE_occurred', 'survived_CE', 'lambda_CE']
+
+def load_results(filepath):
+    """Read a population HDF5 file, pulling only SWEEP_COLUMNS when possible.
+
+    Column selection needs a table-format store; fixed-format files (the
+    run_population.py default) raise, in which case we fall back to a
+    full read.
+
+    The HDF5 chunk cache is sized to the file (capped at 64 MB) so
+    compressed chunks are decompressed once instead of on every column
+    access; libhdf5's 1 MB default thrashes on these stores.
+    """
+    cache_size = min(64 * 1024 * 1024, os.path.getsize(filepath))
+    try:
+        return pd.read_hdf(filepath, 'results', columns=SWEEP_COLUMNS,
+                           CHUNK_CACHE_SIZE=cache_size)
+    except (TypeError, ValueError):
+        return pd.read_hdf(filepath, 'results', CHUNK_CACHE_SIZE=cache_size)
+
 # Define expected data files
 data_files = [
     # Solar metallicity (only α=0.5 available)
@@ -76,11 +125,16 @@ print("\nChecking for data files...")
 loaded_data = []
 missing_files = []
 
+# PyTables releases the GIL around the C-level copy, so reads of the
+# (up to seven) separate files overlap on a small thread pool
+with ThreadPoolExecutor(max_workers=4) as executor:
+    futures = {file_info['file']: executor.submit(load_results, Path(file_info['file']))
+               for file_info in data_files if Path(file_info['file']).exists()}
+
 for file_info in data_files:
-    filepath = Path(file_info['file'])
-    if filepath.exists():
+    if file_info['file'] in futures:
         try:
-            df = pd.read_hdf(filepath, 'results')
+            df = futures[file_info['file']].result()
             loaded_data.append({
                 'data': df,
                 'Z': file_info['Z'],
@@ -131,26 +185,28 @@ for dataset in loaded_data:
     alpha = dataset['alpha']
     
     total = len(df)
-    ce_count = (df['CE_occurred'] == True).sum()
-    survival_count = df['survived_CE'].sum()
-    
+    # count_nonzero is a straight C popcount over the packed bool bytes;
+    # ce_arr is reused below for the lambda mask. Error rows leave the
+    # flags as NaN and must count as False, as the '== True' masks did.
+    ce_arr = df['CE_occurred'].fillna(False).to_numpy(dtype=bool)
+    ce_count = int(np.count_nonzero(ce_arr))
+    survival_count = int(np.count_nonzero(
+        df['survived_CE'].fillna(False).to_numpy(dtype=bool)))
+
     ce_rate = ce_count / total * 100
     survival_rate = survival_count / ce_count * 100 if ce_count > 0 else 0
-    
-    # Confidence intervals
-    ce_ci_low, ce_ci_high = wilson_ci(ce_count, total)
-    if ce_count > 0:
-        surv_ci_low, surv_ci_high = wilson_ci(survival_count, ce_count)
-    else:
-        surv_ci_low, surv_ci_high = 0.0, 0.0
-    
-    # Lambda statistics
-    ce_with_lambda = df[(df['CE_occurred'] == True) & (df['lambda_CE'].notna())]
-    if len(ce_with_lambda) > 0:
-        lambda_mean = ce_with_lambda['lambda_CE'].mean()
-        lambda_std = ce_with_lambda['lambda_CE'].std()
-    else:
-        lambda_mean = lambda_std = np.nan
+
+    # Lambda statistics: materialize the column once and compute both
+    # moments on the same array view (mask fused on raw arrays, no
+    # intermediate DataFrame slice)
+    lambda_vals = df['lambda_CE'].to_numpy(dtype=float)
+    lambda_arr = lambda_vals[ce_arr & ~np.isnan(lambda_vals)]
+    # An empty selection reduces to NaN anyway; suppress the
+    # RuntimeWarning instead of branching on size
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lambda_mean = lambda_arr.mean()
+        lambda_std = lambda_arr.std(ddof=1)
     
     sweep_results.append({
         'Metallicity': Z_label,
@@ -159,24 +215,36 @@ for dataset in loaded_data:
         'Total_Systems': total,
         'CE_Events': ce_count,
         'CE_Rate_%': ce_rate,
-        'CE_Rate_CI_Low_%': ce_ci_low,
-        'CE_Rate_CI_High_%': ce_ci_high,
         'Survivors': survival_count,
         'Survival_Rate_%': survival_rate,
-        'Survival_CI_Low_%': surv_ci_low,
-        'Survival_CI_High_%': surv_ci_high,
         'Lambda_Mean': lambda_mean,
         'Lambda_Std': lambda_std
     })
-    
+
+sweep_df = pd.DataFrame(sweep_results)
+
+# Confidence intervals for all (Z, alpha) datasets in two batched calls
+ce_ci_low, ce_ci_high = wilson_ci(sweep_df['CE_Events'].to_numpy(),
+                                  sweep_df['Total_Systems'].to_numpy())
+surv_ci_low, surv_ci_high = wilson_ci(sweep_df['Survivors'].to_numpy(),
+                                      sweep_df['CE_Events'].to_numpy())
+sweep_df.insert(6, 'CE_Rate_CI_Low_%', ce_ci_low)
+sweep_df.insert(7, 'CE_Rate_CI_High_%', ce_ci_high)
+sweep_df.insert(10, 'Survival_CI_Low_%', surv_ci_low)
+sweep_df.insert(11, 'Survival_CI_High_%', surv_ci_high)
+
+for Z_label, Z, alpha, ce_rate, ce_lo, ce_hi, surv_rate, surv_lo, surv_hi, lam_m, lam_s in zip(
+        sweep_df['Metallicity'], sweep_df['Z'], sweep_df['alpha_CE'],
+        sweep_df['CE_Rate_%'], ce_ci_low, ce_ci_high,
+        sweep_df['Survival_Rate_%'], surv_ci_low, surv_ci_high,
+        sweep_df['Lambda_Mean'], sweep_df['Lambda_Std']):
     print(f"\n{Z_label} Z (Z={Z}), α={alpha}:")
-    print(f"  CE rate: {ce_rate:.1f}% (CI: {ce_ci_low:.1f}-{ce_ci_high:.1f}%)")
-    print(f"  Survival: {survival_rate:.1f}% (CI: {surv_ci_low:.1f}-{surv_ci_high:.1f}%)")
-    print(f"  Lambda: {lambda_mean:.3f} ± {lambda_std:.3f}")
+    print(f"  CE rate: {ce_rate:.1f}% (CI: {ce_lo:.1f}-{ce_hi:.1f}%)")
+    print(f"  Survival: {surv_rate:.1f}% (CI: {surv_lo:.1f}-{surv_hi:.1f}%)")
+    print(f"  Lambda: {lam_m:.3f} ± {lam_s:.3f}")
 
 # Save results
-sweep_df = pd.DataFrame(sweep_results)
-sweep_df.to_csv(sensitivity_dir / 'alpha_sweep_summary.csv', index=False)
+write_csv(sweep_df, sensitivity_dir / 'alpha_sweep_summary.csv')
 print(f"\n✓ Saved: {sensitivity_dir / 'alpha_sweep_summary.csv'}")
 
 # ============================================================================
@@ -186,62 +254,48 @@ print("\n" + "="*70)
 print("GENERATING FIGURES")
 print("="*70)
 
-fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+fig, axes = plt.subplots(1, 2, figsize=(14, 6), constrained_layout=True)
+
+# Per-metallicity slices, the x-limit and the reference alpha lines are
+# the same in both panels; compute them once
+Z_slices = [(Z_label, sweep_df[sweep_df['Metallicity'] == Z_label].sort_values('alpha_CE'),
+             color, marker)
+            for Z_label, color, marker in
+            [('Solar', 'orange', 'o'), ('Mid', 'blue', 's'), ('Low', 'purple', '^')]]
+x_max = max(sweep_df['alpha_CE']) + 0.3
+alpha_refs = [a for a in (0.5, 1.0, 2.0) if a in sweep_df['alpha_CE'].values]
+
+def plot_series(ax, ycol, ci_low_col, ci_high_col, ylabel, title):
+    """Draw one rate-vs-alpha panel (both panels share this layout)."""
+    for Z_label, Z_data, color, marker in Z_slices:
+        if len(Z_data) > 0:
+            ax.errorbar(Z_data['alpha_CE'], Z_data[ycol],
+                        yerr=[Z_data[ycol] - Z_data[ci_low_col],
+                              Z_data[ci_high_col] - Z_data[ycol]],
+                        marker=marker, markersize=10, linewidth=2.5, capsize=6,
+                        label=f'{Z_label} Z (Z={Z_data["Z"].values[0]})',
+                        color=color, markerfacecolor=color, markeredgecolor='black', markeredgewidth=2)
+
+    ax.set_xlabel('Common Envelope Efficiency (αCE)', fontsize=14, weight='bold')
+    ax.set_ylabel(ylabel, fontsize=14, weight='bold')
+    ax.set_title(title, fontsize=16, weight='bold')
+    ax.legend(fontsize=11, loc='best')
+    ax.grid(True, alpha=0.3, linewidth=1.5)
+    ax.set_xlim(0.3, x_max)
+
+    # Add alpha values as reference
+    for alpha_val in alpha_refs:
+        ax.axvline(alpha_val, color='gray', linestyle='--', alpha=0.3, linewidth=1)
 
 # Plot 1: Survival rate vs alpha
-ax = axes[0]
-
-for Z_label, color, marker in [('Solar', 'orange', 'o'), ('Mid', 'blue', 's'), ('Low', 'purple', '^')]:
-    Z_data = sweep_df[sweep_df['Metallicity'] == Z_label].sort_values('alpha_CE')
-    
-    if len(Z_data) > 0:
-        ax.errorbar(Z_data['alpha_CE'], Z_data['Survival_Rate_%'], 
-                    yerr=[Z_data['Survival_Rate_%'] - Z_data['Survival_CI_Low_%'],
-                          Z_data['Survival_CI_High_%'] - Z_data['Survival_Rate_%']],
-                    marker=marker, markersize=10, linewidth=2.5, capsize=6,
-                    label=f'{Z_label} Z (Z={Z_data["Z"].values[0]})',
-                    color=color, markerfacecolor=color, markeredgecolor='black', markeredgewidth=2)
-
-ax.set_xlabel('Common Envelope Efficiency (αCE)', fontsize=14, weight='bold')
-ax.set_ylabel('CE Survival Rate (%)', fontsize=14, weight='bold')
-ax.set_title('Survival Rate vs αCE Parameter', fontsize=16, weight='bold')
-ax.legend(fontsize=11, loc='best')
-ax.grid(True, alpha=0.3, linewidth=1.5)
-ax.set_xlim(0.3, max(sweep_df['alpha_CE']) + 0.3)
-
-# Add alpha values as reference
-for alpha_val in [0.5, 1.0, 2.0]:
-    if alpha_val in sweep_df['alpha_CE'].values:
-        ax.axvline(alpha_val, color='gray', linestyle='--', alpha=0.3, linewidth=1)
+plot_series(axes[0], 'Survival_Rate_%', 'Survival_CI_Low_%', 'Survival_CI_High_%',
+            'CE Survival Rate (%)', 'Survival Rate vs αCE Parameter')
 
 # Plot 2: CE occurrence rate vs alpha
-ax = axes[1]
-
-for Z_label, color, marker in [('Solar', 'orange', 'o'), ('Mid', 'blue', 's'), ('Low', 'purple', '^')]:
-    Z_data = sweep_df[sweep_df['Metallicity'] == Z_label].sort_values('alpha_CE')
-    
-    if len(Z_data) > 0:
-        ax.errorbar(Z_data['alpha_CE'], Z_data['CE_Rate_%'], 
-                    yerr=[Z_data['CE_Rate_%'] - Z_data['CE_Rate_CI_Low_%'],
-                          Z_data['CE_Rate_CI_High_%'] - Z_data['CE_Rate_%']],
-                    marker=marker, markersize=10, linewidth=2.5, capsize=6,
-                    label=f'{Z_label} Z (Z={Z_data["Z"].values[0]})',
-                    color=color, markerfacecolor=color, markeredgecolor='black', markeredgewidth=2)
-
-ax.set_xlabel('Common Envelope Efficiency (αCE)', fontsize=14, weight='bold')
-ax.set_ylabel('CE Occurrence Rate (%)', fontsize=14, weight='bold')
-ax.set_title('CE Occurrence vs αCE Parameter', fontsize=16, weight='bold')
-ax.legend(fontsize=11, loc='best')
-ax.grid(True, alpha=0.3, linewidth=1.5)
-ax.set_xlim(0.3, max(sweep_df['alpha_CE']) + 0.3)
-
-# Add alpha values as reference
-for alpha_val in [0.5, 1.0, 2.0]:
-    if alpha_val in sweep_df['alpha_CE'].values:
-        ax.axvline(alpha_val, color='gray', linestyle='--', alpha=0.3, linewidth=1)
+plot_series(axes[1], 'CE_Rate_%', 'CE_Rate_CI_Low_%', 'CE_Rate_CI_High_%',
+            'CE Occurrence Rate (%)', 'CE Occurrence vs αCE Parameter')
 
-plt.tight_layout()
-plt.savefig(sensitivity_dir / 'survival_vs_alphaCE.png', dpi=300, bbox_inches='tight')
+plt.savefig(sensitivity_dir / 'survival_vs_alphaCE.png', dpi=FIG_DPI)
 print(f"\n✓ Saved: {sensitivity_dir / 'survival_vs_alphaCE.png'}")
 
 # ============================================================================
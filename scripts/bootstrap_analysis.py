@@ -19,10 +19,14 @@ Usage:
 """
 
 import argparse
+import os
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless script; skip GUI-backend init
 import matplotlib.pyplot as plt
 from pathlib import Path
+from joblib import Parallel, delayed
 from tqdm import tqdm
 import warnings
 warnings.filterwarnings('ignore')
@@ -40,6 +44,57 @@ print("="*70)
 # Bootstrap Functions
 # ============================================================================
 
+def write_csv(df, path):
+    """Write a summary CSV, using pyarrow's columnar writer when available.
+
+    Same helper as analyze_alpha_sweep.py: pyarrow writes straight from
+    columnar buffers instead of pandas' per-cell str() path.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except ImportError:
+        df.to_csv(path, index=False)
+
+
+# One PCG64 seed tree for the whole run: every bootstrap draws from a
+# spawned child stream, so results are reproducible run-to-run and the
+# parallel chunks stay statistically independent
+_SEED_SEQ = np.random.SeedSequence(0xC0FFEE)
+
+
+def _boot_chunk(data, n_iters, seed):
+    """Resample `data` n_iters times and return the per-sample means."""
+    rng = np.random.default_rng(seed)
+    n = len(data)
+    idx = rng.integers(0, n, size=(n_iters, n), dtype=np.int32)
+    return data[idx].mean(axis=1)
+
+
+def _bootstrap_means(data, n_iterations):
+    """
+    Bootstrap means of `data`, tiled across CPU cores for large jobs.
+
+    The iterations are independent, so they are split into per-core
+    chunks (each with its own SeedSequence-spawned stream) and
+    concatenated. Small jobs run in process: the index matrix fits in
+    cache and worker startup would dominate.
+    """
+    n_workers = os.cpu_count() or 1
+    seed_seq = _SEED_SEQ.spawn(1)[0]
+
+    if n_workers == 1 or n_iterations * len(data) < 4_000_000:
+        return _boot_chunk(data, n_iterations, seed_seq)
+
+    counts = [n_iterations // n_workers] * n_workers
+    counts[-1] += n_iterations - sum(counts)
+    seeds = seed_seq.spawn(n_workers)
+    chunks = Parallel(n_jobs=n_workers)(
+        delayed(_boot_chunk)(data, c, s) for c, s in zip(counts, seeds))
+    return np.concatenate(chunks)
+
+
 def bootstrap_rate(data, n_iterations=10000, alpha=0.05):
     """
     Bootstrap confidence interval for a rate (proportion).
@@ -57,25 +112,22 @@ def bootstrap_rate(data, n_iterations=10000, alpha=0.05):
     --------
     dict with mean, std, CI_low, CI_high (all as percentages)
     """
-    data = np.array(data)
+    # uint8 so the per-sample mean reduces to a fast integer sum
+    data = np.asarray(data, dtype=np.uint8)
     n = len(data)
-    
+
     if n == 0:
         return {'mean': 0.0, 'std': 0.0, 'CI_low': 0.0, 'CI_high': 0.0}
-    
-    # Bootstrap sampling
-    bootstrap_rates = []
-    for _ in range(n_iterations):
-        sample = np.random.choice(data, size=n, replace=True)
-        bootstrap_rates.append(sample.mean() * 100)
-    
-    bootstrap_rates = np.array(bootstrap_rates)
-    
+
+    # Vectorized bootstrap: all resample indices drawn in bulk and
+    # reduced along axis 1 (parallelized across cores when large)
+    bootstrap_rates = _bootstrap_means(data, n_iterations) * 100
+
     # Calculate statistics
     mean_rate = bootstrap_rates.mean()
     std_rate = bootstrap_rates.std()
-    ci_low = np.percentile(bootstrap_rates, alpha/2 * 100)
-    ci_high = np.percentile(bootstrap_rates, (1 - alpha/2) * 100)
+    ci_low, ci_high = np.percentile(bootstrap_rates,
+                                    [alpha/2 * 100, (1 - alpha/2) * 100])
     
     return {
         'mean': mean_rate,
@@ -105,23 +157,18 @@ def bootstrap_mean(data, n_iterations=10000, alpha=0.05):
     data = np.array(data)
     data = data[~np.isnan(data)]  # Remove NaN
     n = len(data)
-    
+
     if n == 0:
         return {'mean': np.nan, 'std': np.nan, 'CI_low': np.nan, 'CI_high': np.nan}
-    
-    # Bootstrap sampling
-    bootstrap_means = []
-    for _ in range(n_iterations):
-        sample = np.random.choice(data, size=n, replace=True)
-        bootstrap_means.append(sample.mean())
-    
-    bootstrap_means = np.array(bootstrap_means)
-    
+
+    # Vectorized bootstrap (see bootstrap_rate)
+    bootstrap_means = _bootstrap_means(data, n_iterations)
+
     # Calculate statistics
     mean_val = bootstrap_means.mean()
     std_val = bootstrap_means.std()
-    ci_low = np.percentile(bootstrap_means, alpha/2 * 100)
-    ci_high = np.percentile(bootstrap_means, (1 - alpha/2) * 100)
+    ci_low, ci_high = np.percentile(bootstrap_means,
+                                    [alpha/2 * 100, (1 - alpha/2) * 100])
     
     return {
         'mean': mean_val,
@@ -131,55 +178,67 @@ def bootstrap_mean(data, n_iterations=10000, alpha=0.05):
         'distribution': bootstrap_means
     }
 
-def bootstrap_survival_by_lambda(ce_data, lambda_bins, n_iterations=10000):
+def bootstrap_survival_by_lambda(lambda_vals, survived, lambda_bins,
+                                 n_iterations=10000):
     """
     Bootstrap survival probability in lambda bins.
-    
+
     Parameters:
     -----------
-    ce_data : DataFrame
-        CE events with 'lambda_CE' and 'survived_CE'
+    lambda_vals : array
+        Lambda values of the CE events
+    survived : array of bool
+        Survival outcome per CE event, aligned with lambda_vals
     lambda_bins : array
         Bin edges for lambda
     n_iterations : int
         Number of bootstrap samples
-    
+
     Returns:
     --------
     DataFrame with binned survival probabilities and CIs
     """
-    n = len(ce_data)
     n_bins = len(lambda_bins) - 1
-    
+
+    # Digitize lambda once: one O(n) pass replaces a boolean scan per bin
+    codes = np.digitize(np.asarray(lambda_vals), lambda_bins) - 1
+    in_range = (codes >= 0) & (codes < n_bins)
+    bin_counts = np.bincount(codes[in_range], minlength=n_bins)
+    survived = np.asarray(survived, dtype=np.uint8)
+
+    # Group events by bin with one stable argsort; each bin becomes a
+    # contiguous slice of the sorted survival array, replacing a full
+    # codes == i scan per bin
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    sorted_surv = survived[order]
+    edges = np.arange(n_bins)
+    bin_starts = np.searchsorted(sorted_codes, edges, side='left')
+    bin_ends = np.searchsorted(sorted_codes, edges, side='right')
+
     # Pre-allocate results
     bin_results = []
-    
+
     for i in range(n_bins):
         bin_min = lambda_bins[i]
         bin_max = lambda_bins[i+1]
         bin_label = f"{bin_min:.2f}-{bin_max:.2f}"
-        
-        # Get data in this bin
-        mask = (ce_data['lambda_CE'] >= bin_min) & (ce_data['lambda_CE'] < bin_max)
-        bin_data = ce_data[mask]
-        
-        if len(bin_data) == 0:
+
+        if bin_counts[i] == 0:
             continue
-        
-        # Bootstrap this bin
-        bootstrap_rates = []
-        for _ in range(n_iterations):
-            sample = bin_data.sample(n=len(bin_data), replace=True)
-            survival_rate = sample['survived_CE'].mean() * 100
-            bootstrap_rates.append(survival_rate)
-        
-        bootstrap_rates = np.array(bootstrap_rates)
-        
+
+        # Resampling only touches this bin's contiguous uint8 slice
+        surv = sorted_surv[bin_starts[i]:bin_ends[i]]
+        n_bin = len(surv)
+
+        # Bootstrap this bin with bulk integer indexing (no .sample calls)
+        bootstrap_rates = _bootstrap_means(surv, n_iterations) * 100
+
         bin_results.append({
             'Lambda_Bin': bin_label,
             'Lambda_Min': bin_min,
             'Lambda_Max': bin_max,
-            'N_Systems': len(bin_data),
+            'N_Systems': n_bin,
             'Mean_Survival_%': bootstrap_rates.mean(),
             'Std_Survival_%': bootstrap_rates.std(),
             'CI_Low_%': np.percentile(bootstrap_rates, 2.5),
@@ -193,11 +252,45 @@ def bootstrap_survival_by_lambda(ce_data, lambda_bins, n_iterations=10000):
 # ============================================================================
 
 print("\nLoading data...")
+
+# Every analysis below touches only these three columns
+BOOT_COLUMNS = ['CE_occurred', 'survived_CE', 'lambda_CE']
+
+def _load_results(path):
+    # A Feather sidecar (written on first load) skips HDF5 decompression
+    # on re-runs; iterating on --n_boot pays the load cost every time
+    # otherwise. Rebuilt automatically whenever the HDF5 file is newer.
+    path = Path(path)
+    sidecar = path.with_suffix('.feather')
+    try:
+        if sidecar.stat().st_mtime >= path.stat().st_mtime:
+            return pd.read_feather(sidecar)
+    except Exception:
+        pass  # no sidecar yet, or unreadable: fall through to HDF5
+
+    # Size the HDF5 chunk cache to the file (capped at 64 MB) so
+    # compressed chunks decompress once, not per column access
+    cache_size = min(64 * 1024 * 1024, os.path.getsize(path))
+    try:
+        # Table-format stores support column selection; skip the columns
+        # the bootstrap never reads
+        df = pd.read_hdf(path, 'results', columns=BOOT_COLUMNS,
+                         CHUNK_CACHE_SIZE=cache_size)
+    except (TypeError, ValueError):
+        # Fixed-format store: column selection unsupported, full read
+        df = pd.read_hdf(path, 'results', CHUNK_CACHE_SIZE=cache_size)
+
+    try:
+        df.reset_index(drop=True).to_feather(sidecar)
+    except Exception:
+        pass  # pyarrow missing or read-only data dir; cache is optional
+    return df
+
 datasets = {}
 try:
-    datasets['Solar'] = pd.read_hdf('data/ce_fixed_lambda.h5', 'results')
-    datasets['Mid'] = pd.read_hdf('data/mid_Z_lambda.h5', 'results')
-    datasets['Low'] = pd.read_hdf('data/low_Z_lambda.h5', 'results')
+    datasets['Solar'] = _load_results('data/ce_fixed_lambda.h5')
+    datasets['Mid'] = _load_results('data/mid_Z_lambda.h5')
+    datasets['Low'] = _load_results('data/low_Z_lambda.h5')
     print("✓ All datasets loaded")
 except Exception as e:
     print(f"✗ Error loading data: {e}")
@@ -216,20 +309,45 @@ print("\n" + "="*70)
 print("ANALYSIS 1: CE OCCURRENCE RATES (Bootstrap)")
 print("="*70)
 
-def main(n_boot=10000):
-    ce_rate_results = []
-    
+def main(n_boot=10000, fig_dpi=150, seed=None):
+    # Re-root the PCG64 seed tree when a seed is given; the default
+    # fixed seed already makes repeat runs reproducible
+    global _SEED_SEQ
+    if seed is not None:
+        _SEED_SEQ = np.random.SeedSequence(seed)
+    # Materialize each dataset's columns as plain NumPy arrays once up
+    # front; analyses 1-4 read from this cache instead of re-masking
+    # DataFrames. The subsets (CE events, CE events with lambda) are
+    # masked arrays, not row-copied frames.
+    cache = {}
     for name, df in datasets.items():
-        print(f"\nBootstrapping {name} metallicity (n={len(df)})...")
-        
+        ce_mask = df['CE_occurred'].fillna(False).to_numpy(dtype=bool)
+        survived = df['survived_CE'].fillna(False).to_numpy(dtype=bool)
+        lam = df['lambda_CE'].to_numpy(dtype=float)
+        lambda_mask = ce_mask & ~np.isnan(lam)
+        cache[name] = {
+            'ce_occ': ce_mask,
+            'survived_ce': survived[ce_mask],
+            # float32 halves the bandwidth of the (n_iter, n) gather in
+            # the bootstrap; plenty of precision for 3-decimal lambdas
+            'lambda_ce': lam[lambda_mask].astype(np.float32),
+            'survived_lambda': survived[lambda_mask],
+            'Z': df['Z_val'].iloc[0],
+        }
+
+    ce_rate_results = []
+
+    for name, arrays in cache.items():
+        ce_occurred = arrays['ce_occ']
+        print(f"\nBootstrapping {name} metallicity (n={len(ce_occurred)})...")
+
         # CE occurrence
-        ce_occurred = df['CE_occurred'].fillna(False).values
         ce_stats = bootstrap_rate(ce_occurred, n_iterations=n_boot)
-        
+
         ce_rate_results.append({
             'Metallicity': name,
-            'Z': df['Z_val'].iloc[0],
-            'Total_Systems': len(df),
+            'Z': arrays['Z'],
+            'Total_Systems': len(ce_occurred),
             'CE_Rate_Mean_%': ce_stats['mean'],
             'CE_Rate_Std_%': ce_stats['std'],
             'CE_Rate_CI_Low_%': ce_stats['CI_low'],
@@ -240,7 +358,7 @@ def main(n_boot=10000):
         print(f"  95% CI: [{ce_stats['CI_low']:.1f}%, {ce_stats['CI_high']:.1f}%]")
     
     ce_rate_df = pd.DataFrame(ce_rate_results)
-    ce_rate_df.to_csv(bootstrap_dir / 'ce_rates_bootstrap.csv', index=False)
+    write_csv(ce_rate_df, bootstrap_dir / 'ce_rates_bootstrap.csv')
     print(f"\n✓ Saved: {bootstrap_dir / 'ce_rates_bootstrap.csv'}")
     
     # ============================================================================
@@ -252,24 +370,23 @@ def main(n_boot=10000):
     print("="*70)
     
     survival_results = []
-    
-    for name, df in datasets.items():
-        # Filter to CE events only
-        ce_events = df[df['CE_occurred'] == True]
-        
-        if len(ce_events) == 0:
+
+    for name, arrays in cache.items():
+        # CE events only (precomputed above)
+        survived = arrays['survived_ce']
+
+        if len(survived) == 0:
             print(f"\n{name}: No CE events")
             continue
-        
-        print(f"\nBootstrapping {name} survival (n={len(ce_events)} CE events)...")
-        
-        survived = ce_events['survived_CE'].fillna(False).values
+
+        print(f"\nBootstrapping {name} survival (n={len(survived)} CE events)...")
+
         survival_stats = bootstrap_rate(survived, n_iterations=n_boot)
-        
+
         survival_results.append({
             'Metallicity': name,
-            'Z': df['Z_val'].iloc[0],
-            'CE_Events': len(ce_events),
+            'Z': arrays['Z'],
+            'CE_Events': len(survived),
             'Survival_Mean_%': survival_stats['mean'],
             'Survival_Std_%': survival_stats['std'],
             'Survival_CI_Low_%': survival_stats['CI_low'],
@@ -280,7 +397,7 @@ def main(n_boot=10000):
         print(f"  95% CI: [{survival_stats['CI_low']:.1f}%, {survival_stats['CI_high']:.1f}%]")
     
     survival_df = pd.DataFrame(survival_results)
-    survival_df.to_csv(bootstrap_dir / 'survival_rates_bootstrap.csv', index=False)
+    write_csv(survival_df, bootstrap_dir / 'survival_rates_bootstrap.csv')
     print(f"\n✓ Saved: {bootstrap_dir / 'survival_rates_bootstrap.csv'}")
     
     # ============================================================================
@@ -292,24 +409,23 @@ def main(n_boot=10000):
     print("="*70)
     
     lambda_results = []
-    
-    for name, df in datasets.items():
-        # Filter to CE events with lambda
-        ce_with_lambda = df[(df['CE_occurred'] == True) & (df['lambda_CE'].notna())]
-        
-        if len(ce_with_lambda) == 0:
+
+    for name, arrays in cache.items():
+        # CE events with lambda (precomputed above)
+        lambda_vals = arrays['lambda_ce']
+
+        if len(lambda_vals) == 0:
             print(f"\n{name}: No lambda data")
             continue
-        
-        print(f"\nBootstrapping {name} lambda (n={len(ce_with_lambda)})...")
-        
-        lambda_vals = ce_with_lambda['lambda_CE'].values
+
+        print(f"\nBootstrapping {name} lambda (n={len(lambda_vals)})...")
+
         lambda_stats = bootstrap_mean(lambda_vals, n_iterations=n_boot)
-        
+
         lambda_results.append({
             'Metallicity': name,
-            'Z': df['Z_val'].iloc[0],
-            'N_Systems': len(ce_with_lambda),
+            'Z': arrays['Z'],
+            'N_Systems': len(lambda_vals),
             'Lambda_Mean': lambda_stats['mean'],
             'Lambda_Std': lambda_stats['std'],
             'Lambda_CI_Low': lambda_stats['CI_low'],
@@ -320,7 +436,7 @@ def main(n_boot=10000):
         print(f"  95% CI: [{lambda_stats['CI_low']:.3f}, {lambda_stats['CI_high']:.3f}]")
     
     lambda_df = pd.DataFrame(lambda_results)
-    lambda_df.to_csv(bootstrap_dir / 'lambda_bootstrap.csv', index=False)
+    write_csv(lambda_df, bootstrap_dir / 'lambda_bootstrap.csv')
     print(f"\n✓ Saved: {bootstrap_dir / 'lambda_bootstrap.csv'}")
     
     # ============================================================================
@@ -331,24 +447,20 @@ def main(n_boot=10000):
     print("ANALYSIS 4: SURVIVAL VS LAMBDA (Bootstrap)")
     print("="*70)
     
-    # Combine all CE events
-    all_ce = pd.concat([
-        datasets['Solar'][(datasets['Solar']['CE_occurred'] == True) & 
-                         (datasets['Solar']['lambda_CE'].notna())],
-        datasets['Mid'][(datasets['Mid']['CE_occurred'] == True) & 
-                       (datasets['Mid']['lambda_CE'].notna())],
-        datasets['Low'][(datasets['Low']['CE_occurred'] == True) & 
-                       (datasets['Low']['lambda_CE'].notna())]
-    ])
-    
-    print(f"\nCombined CE events: {len(all_ce)}")
+    # Combine all CE events with lambda (precomputed above); two plain
+    # array concatenations, no cross-dataset DataFrame is built
+    all_lambda = np.concatenate([cache[n]['lambda_ce'] for n in cache])
+    all_survived = np.concatenate([cache[n]['survived_lambda'] for n in cache])
+
+    print(f"\nCombined CE events: {len(all_lambda)}")
     
     # Define lambda bins
     lambda_bins = np.array([0, 0.03, 0.06, 0.10, 0.15, 0.25, 1.0])
     
     print(f"Bootstrapping survival in {len(lambda_bins)-1} lambda bins...")
-    survival_by_lambda = bootstrap_survival_by_lambda(all_ce, lambda_bins, n_iterations=n_boot)
-    survival_by_lambda.to_csv(bootstrap_dir / 'survival_vs_lambda_bootstrap.csv', index=False)
+    survival_by_lambda = bootstrap_survival_by_lambda(all_lambda, all_survived,
+                                                      lambda_bins, n_iterations=n_boot)
+    write_csv(survival_by_lambda, bootstrap_dir / 'survival_vs_lambda_bootstrap.csv')
     print(f"\n✓ Saved: {bootstrap_dir / 'survival_vs_lambda_bootstrap.csv'}")
     
     for _, row in survival_by_lambda.iterrows():
@@ -364,78 +476,86 @@ def main(n_boot=10000):
     print("GENERATING FIGURES")
     print("="*70)
     
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-    
-    # Plot 1: CE Occurrence Rates with Bootstrap CIs
-    ax = axes[0, 0]
-    x = np.arange(len(ce_rate_df))
-    ax.bar(x, ce_rate_df['CE_Rate_Mean_%'], color='steelblue', alpha=0.7, 
-           edgecolor='black', linewidth=2)
-    ax.errorbar(x, ce_rate_df['CE_Rate_Mean_%'],
-                yerr=[ce_rate_df['CE_Rate_Mean_%'] - ce_rate_df['CE_Rate_CI_Low_%'],
-                      ce_rate_df['CE_Rate_CI_High_%'] - ce_rate_df['CE_Rate_Mean_%']],
-                fmt='none', ecolor='black', capsize=8, capthick=2)
-    ax.set_xticks(x)
-    ax.set_xticklabels(ce_rate_df['Metallicity'])
-    ax.set_ylabel('CE Occurrence Rate (%)', fontsize=12, weight='bold')
-    ax.set_title(f'CE Rates with Bootstrap CIs (n={n_boot})', fontsize=14, weight='bold')
-    ax.grid(True, alpha=0.3, axis='y')
-    
-    # Plot 2: Survival Rates with Bootstrap CIs
-    ax = axes[0, 1]
-    x = np.arange(len(survival_df))
-    colors = ['green' if rate > 0 else 'red' for rate in survival_df['Survival_Mean_%']]
-    ax.bar(x, survival_df['Survival_Mean_%'], color=colors, alpha=0.7,
-           edgecolor='black', linewidth=2)
-    ax.errorbar(x, survival_df['Survival_Mean_%'],
-                yerr=[survival_df['Survival_Mean_%'] - survival_df['Survival_CI_Low_%'],
-                      survival_df['Survival_CI_High_%'] - survival_df['Survival_Mean_%']],
-                fmt='none', ecolor='black', capsize=8, capthick=2)
-    ax.set_xticks(x)
-    ax.set_xticklabels(survival_df['Metallicity'])
-    ax.set_ylabel('CE Survival Rate (%)', fontsize=12, weight='bold')
-    ax.set_title(f'Survival Rates with Bootstrap CIs (n={n_boot})', fontsize=14, weight='bold')
-    ax.grid(True, alpha=0.3, axis='y')
-    
-    # Plot 3: Lambda with Bootstrap CIs
-    ax = axes[1, 0]
-    x = np.arange(len(lambda_df))
-    ax.errorbar(x, lambda_df['Lambda_Mean'],
-                yerr=[lambda_df['Lambda_Mean'] - lambda_df['Lambda_CI_Low'],
-                      lambda_df['Lambda_CI_High'] - lambda_df['Lambda_Mean']],
-                marker='o', markersize=12, linewidth=2.5, capsize=8, capthick=2,
-                color='steelblue', markerfacecolor='orange', 
-                markeredgecolor='black', markeredgewidth=2)
-    ax.axhline(0.5, color='red', linestyle='--', linewidth=2, alpha=0.7, label='Classical: λ=0.5')
-    ax.set_xticks(x)
-    ax.set_xticklabels(lambda_df['Metallicity'])
-    ax.set_ylabel('Mean Lambda (λ)', fontsize=12, weight='bold')
-    ax.set_title(f'Lambda with Bootstrap CIs (n={n_boot})', fontsize=14, weight='bold')
-    ax.legend(fontsize=10)
-    ax.grid(True, alpha=0.3)
-    
-    # Plot 4: Survival vs Lambda (Binned) with Bootstrap CIs
-    ax = axes[1, 1]
-    x = np.arange(len(survival_by_lambda))
-    ax.bar(x, survival_by_lambda['Mean_Survival_%'], color='purple', alpha=0.7,
-           edgecolor='black', linewidth=2)
-    ax.errorbar(x, survival_by_lambda['Mean_Survival_%'],
-                yerr=[survival_by_lambda['Mean_Survival_%'] - survival_by_lambda['CI_Low_%'],
-                      survival_by_lambda['CI_High_%'] - survival_by_lambda['Mean_Survival_%']],
-                fmt='none', ecolor='black', capsize=6, capthick=2)
-    ax.set_xticks(x)
-    ax.set_xticklabels(survival_by_lambda['Lambda_Bin'], rotation=45, ha='right')
-    ax.set_xlabel('Lambda Bin', fontsize=12, weight='bold')
-    ax.set_ylabel('Survival Probability (%)', fontsize=12, weight='bold')
-    ax.set_title(f'Survival vs Lambda (n={n_boot})', fontsize=14, weight='bold')
-    ax.grid(True, alpha=0.3, axis='y')
-    
-    # Add sample sizes
-    for i, n in enumerate(survival_by_lambda['N_Systems']):
-        ax.text(i, -5, f'n={n}', ha='center', fontsize=9)
-    
-    plt.tight_layout()
-    plt.savefig(bootstrap_dir / 'bootstrap_analysis.png', dpi=300, bbox_inches='tight')
+    # rcParams set once for all four panels (constrained_layout avoids
+    # tight_layout's iterative post-hoc solve). Each panel indexes its own
+    # frame: survival_df/lambda_df can be shorter than ce_rate_df when a
+    # dataset had no CE events or no lambda data
+    with plt.rc_context({'axes.labelsize': 12, 'axes.labelweight': 'bold',
+                         'axes.titlesize': 14, 'axes.titleweight': 'bold',
+                         'axes.grid': True, 'grid.alpha': 0.3}):
+        fig, axes = plt.subplots(2, 2, figsize=(14, 10), constrained_layout=True)
+
+        # Plot 1: CE Occurrence Rates with Bootstrap CIs
+        ax = axes[0, 0]
+        x = np.arange(len(ce_rate_df))
+        ax.bar(x, ce_rate_df['CE_Rate_Mean_%'], color='steelblue', alpha=0.7,
+               edgecolor='black', linewidth=2)
+        ax.errorbar(x, ce_rate_df['CE_Rate_Mean_%'],
+                    yerr=[ce_rate_df['CE_Rate_Mean_%'] - ce_rate_df['CE_Rate_CI_Low_%'],
+                          ce_rate_df['CE_Rate_CI_High_%'] - ce_rate_df['CE_Rate_Mean_%']],
+                    fmt='none', ecolor='black', capsize=8, capthick=2)
+        ax.set_xticks(x)
+        ax.set_xticklabels(ce_rate_df['Metallicity'])
+        ax.set_ylabel('CE Occurrence Rate (%)')
+        ax.set_title(f'CE Rates with Bootstrap CIs (n={n_boot})')
+        ax.grid(axis='y')
+
+        # Plot 2: Survival Rates with Bootstrap CIs
+        ax = axes[0, 1]
+        x = np.arange(len(survival_df))
+        colors = ['green' if rate > 0 else 'red' for rate in survival_df['Survival_Mean_%']]
+        ax.bar(x, survival_df['Survival_Mean_%'], color=colors, alpha=0.7,
+               edgecolor='black', linewidth=2)
+        ax.errorbar(x, survival_df['Survival_Mean_%'],
+                    yerr=[survival_df['Survival_Mean_%'] - survival_df['Survival_CI_Low_%'],
+                          survival_df['Survival_CI_High_%'] - survival_df['Survival_Mean_%']],
+                    fmt='none', ecolor='black', capsize=8, capthick=2)
+        ax.set_xticks(x)
+        ax.set_xticklabels(survival_df['Metallicity'])
+        ax.set_ylabel('CE Survival Rate (%)')
+        ax.set_title(f'Survival Rates with Bootstrap CIs (n={n_boot})')
+        ax.grid(axis='y')
+
+        # Plot 3: Lambda with Bootstrap CIs
+        ax = axes[1, 0]
+        x = np.arange(len(lambda_df))
+        ax.errorbar(x, lambda_df['Lambda_Mean'],
+                    yerr=[lambda_df['Lambda_Mean'] - lambda_df['Lambda_CI_Low'],
+                          lambda_df['Lambda_CI_High'] - lambda_df['Lambda_Mean']],
+                    marker='o', markersize=12, linewidth=2.5, capsize=8, capthick=2,
+                    color='steelblue', markerfacecolor='orange',
+                    markeredgecolor='black', markeredgewidth=2)
+        ax.axhline(0.5, color='red', linestyle='--', linewidth=2, alpha=0.7, label='Classical: λ=0.5')
+        ax.set_xticks(x)
+        ax.set_xticklabels(lambda_df['Metallicity'])
+        ax.set_ylabel('Mean Lambda (λ)')
+        ax.set_title(f'Lambda with Bootstrap CIs (n={n_boot})')
+        ax.legend(fontsize=10)
+
+        # Plot 4: Survival vs Lambda (Binned) with Bootstrap CIs
+        ax = axes[1, 1]
+        x_bins = np.arange(len(survival_by_lambda))
+        ax.bar(x_bins, survival_by_lambda['Mean_Survival_%'], color='purple', alpha=0.7,
+               edgecolor='black', linewidth=2)
+        ax.errorbar(x_bins, survival_by_lambda['Mean_Survival_%'],
+                    yerr=[survival_by_lambda['Mean_Survival_%'] - survival_by_lambda['CI_Low_%'],
+                          survival_by_lambda['CI_High_%'] - survival_by_lambda['Mean_Survival_%']],
+                    fmt='none', ecolor='black', capsize=6, capthick=2)
+        ax.set_xticks(x_bins)
+        ax.set_xticklabels(survival_by_lambda['Lambda_Bin'], rotation=45, ha='right')
+        ax.set_xlabel('Lambda Bin')
+        ax.set_ylabel('Survival Probability (%)')
+        ax.set_title(f'Survival vs Lambda (n={n_boot})')
+        ax.grid(axis='y')
+
+        # Add sample sizes
+        for i, n in enumerate(survival_by_lambda['N_Systems']):
+            ax.text(i, -5, f'n={n}', ha='center', fontsize=9)
+
+    # Rasterization cost scales with pixel count, so the default DPI is
+    # preview quality; pass --dpi 300 for the publication render
+    plt.savefig(bootstrap_dir / 'bootstrap_analysis.png', dpi=fig_dpi, bbox_inches='tight')
+    plt.close(fig)
     print(f"\n✓ Saved: {bootstrap_dir / 'bootstrap_analysis.png'}")
     
     # ============================================================================
@@ -464,8 +584,12 @@ if __name__ == '__main__':
     )
     parser.add_argument('--n_boot', type=int, default=10000,
                        help='Number of bootstrap iterations (default: 10000)')
-    
+    parser.add_argument('--dpi', type=int, default=150,
+                       help='Figure resolution (default: 150; use 300 for publication)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Override the bootstrap RNG seed')
+
     args = parser.parse_args()
-    
+
     print(f"\nBootstrap iterations: {args.n_boot}")
-    main(n_boot=args.n_boot)
+    main(n_boot=args.n_boot, fig_dpi=args.dpi, seed=args.seed)
@@ -16,20 +16,28 @@ Usage:
 """
 
 import argparse
+import json
+import os
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless script; skip GUI-backend init
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from scipy.stats import beta
-from scipy.ndimage import gaussian_filter
-import warnings
-warnings.filterwarnings('ignore')
+from scipy.special import betaincinv
+# No blanket warnings filter: the only expected numeric warnings (empty
+# Wilson intervals) are already scoped with np.errstate in wilson_ci, and
+# suppressing everything hides genuine pandas performance warnings
 
 # Create output directory
 results_dir = Path('results')
 physics_dir = results_dir / 'physics'
 physics_dir.mkdir(parents=True, exist_ok=True)
 
+# Figure resolution: 150 dpi for dev runs, set FIG_DPI=300 for publication
+FIG_DPI = int(os.environ.get('FIG_DPI', '150'))
+
 print("="*70)
 print("DETAILED PHYSICS MECHANISM ANALYSIS")
 print("="*70)
@@ -39,18 +47,28 @@ print("="*70)
 # ============================================================================
 
 def wilson_ci(k, n, alpha=0.05):
-    """Wilson score confidence interval for binomial proportion."""
-    if n == 0:
-        return 0.0, 0.0
-    if k == 0:
-        lower = 0.0
-        upper = 1 - alpha**(1/n)
-    elif k == n:
-        lower = alpha**(1/n)
-        upper = 1.0
-    else:
-        lower = beta.ppf(alpha/2, k, n-k+1) if k > 0 else 0.0
-        upper = beta.ppf(1-alpha/2, k+1, n-k) if k < n else 1.0
+    """Wilson score confidence interval for binomial proportion.
+
+    Accepts scalars or arrays of (k, n). Uses betaincinv (the regularized
+    inverse incomplete beta underlying beta.ppf) directly, skipping the
+    rv_continuous dispatch layer, and evaluates it once over all bins.
+    """
+    k = np.asarray(k, dtype=float)
+    n = np.asarray(n, dtype=float)
+
+    interior = (k > 0) & (k < n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lower = np.where(interior, betaincinv(k, n-k+1, alpha/2),
+                         np.where(k == 0, 0.0, alpha**(1/n)))
+        upper = np.where(interior, betaincinv(k+1, n-k, 1-alpha/2),
+                         np.where(k == n, 1.0, 1 - alpha**(1/n)))
+
+    # Empty bins have no interval
+    lower = np.where(n == 0, 0.0, lower)
+    upper = np.where(n == 0, 0.0, upper)
+
+    if lower.ndim == 0:
+        return float(lower) * 100, float(upper) * 100
     return lower * 100, upper * 100
 
 def classify_donor_type(donor_state):
@@ -82,134 +100,258 @@ def classify_donor_type(donor_state):
     else:
         return 'Other'
 
+# Canonical metallicity order used by every per-Z breakdown below; rows
+# carry a matching int8 Z_code column (see build_all_ce)
+Z_ORDER = [0.014, 0.006, 0.001]
+
+# Shared bin edges, built once at import: 6 bins for the 1-D analyses,
+# a 7x7 grid for the 2-D survival maps
+Q_BINS = np.linspace(0.4, 1.0, 7)
+P_BINS = np.logspace(np.log10(50), np.log10(5000), 7)
+MAP_Q_BINS = np.linspace(0.4, 1.0, 8)
+MAP_P_BINS = np.logspace(np.log10(50), np.log10(5000), 8)
+
 # ============================================================================
 # Load Data
 # ============================================================================
 
 print("\nLoading data...")
 
+# Only these columns are used by the analyses below
+ANALYSIS_COLUMNS = ['CE_occurred', 'lambda_CE', 'survived_CE', 'donor_state',
+                    'q_initial', 'P_initial']
+
+def load_results(file, columns=None, chunksize=200_000):
+    """Read a results table, restricted to the needed columns when possible.
+
+    Table-format stores are streamed in chunks so peak memory is bounded
+    by chunksize rather than the whole file; fixed-format stores don't
+    support column selection or iteration and fall back to a full read.
+
+    The HDF5 chunk cache is sized up from the 1 MB default (capped at
+    64 MB or the file size) so chunks shared by consecutive reads stay
+    cached instead of being decompressed repeatedly.
+    """
+    cache_size = min(64 * 1024 * 1024, os.path.getsize(file))
+    try:
+        with pd.HDFStore(file, mode='r',
+                         CHUNK_CACHE_SIZE=cache_size) as store:
+            parts = list(store.select('results', columns=columns,
+                                      chunksize=chunksize))
+        return pd.concat(parts, ignore_index=True)
+    except (TypeError, ValueError):
+        df = pd.read_hdf(file, 'results', CHUNK_CACHE_SIZE=cache_size)
+        return df[columns] if columns is not None else df
+
+# Baseline datasets
+BASELINE_FILES = {
+    'Solar (α=0.5)': ('data/ce_fixed_lambda.h5', 0.014, 0.5),
+    'Mid (α=0.5)': ('data/mid_Z_lambda.h5', 0.006, 0.5),
+    'Low (α=0.5)': ('data/low_Z_lambda.h5', 0.001, 0.5)
+}
+
+# Alpha sweep datasets (optional)
+ALPHA_FILES = {
+    'Low (α=1.0)': ('data/low_Z_alpha1p0.h5', 0.001, 1.0),
+    'Low (α=2.0)': ('data/low_Z_alpha2p0.h5', 0.001, 2.0),
+    'Mid (α=1.0)': ('data/mid_Z_alpha1p0.h5', 0.006, 1.0),
+    'Mid (α=2.0)': ('data/mid_Z_alpha2p0.h5', 0.006, 2.0)
+}
+
 def load_datasets(include_alpha=False):
     """Load baseline and optionally alpha sweep datasets."""
     datasets = {}
-    
-    # Baseline datasets
-    baseline_files = {
-        'Solar (α=0.5)': ('data/ce_fixed_lambda.h5', 0.014, 0.5),
-        'Mid (α=0.5)': ('data/mid_Z_lambda.h5', 0.006, 0.5),
-        'Low (α=0.5)': ('data/low_Z_lambda.h5', 0.001, 0.5)
-    }
-    
-    for name, (file, Z, alpha) in baseline_files.items():
-        try:
-            df = pd.read_hdf(file, 'results')
-            df['Z_val'] = Z
-            df['alpha_CE'] = alpha
-            df['dataset_name'] = name
-            datasets[name] = df
-            print(f"  ✓ {name}: {len(df)} systems")
-        except Exception as e:
-            print(f"  ✗ Error loading {file}: {e}")
-    
-    # Alpha sweep datasets (optional)
+
+    baseline_files = BASELINE_FILES
+    alpha_files = ALPHA_FILES
+
+    # Shared category list so dataset_name stays categorical across concat
+    dataset_names = list(baseline_files) + list(alpha_files)
+
+    def label_dataset(df, name, Z, alpha):
+        """Attach constant per-source columns as typed arrays, not scalars."""
+        # Narrow the per-row payload up front: float32 carries more
+        # precision than the simulation outputs, and the flags are 0/1.
+        # Z_val and alpha_CE stay float64 — they are filtered and
+        # reindexed by exact equality against literals like 0.014, which
+        # float32 cannot represent.
+        for c in ('lambda_CE', 'q_initial', 'P_initial'):
+            df[c] = df[c].astype(np.float32)
+        # Error rows leave the flags as NaN; treat them as False like the
+        # original '== True' masks did (a bare uint8 cast would raise)
+        for c in ('CE_occurred', 'survived_CE'):
+            df[c] = df[c].fillna(False).astype(np.uint8)
+        df['Z_val'] = np.full(len(df), Z)
+        df['alpha_CE'] = np.full(len(df), alpha)
+        df['dataset_name'] = pd.Categorical.from_codes(
+            np.full(len(df), dataset_names.index(name), dtype=np.int8),
+            categories=dataset_names)
+        return df
+
+    to_load = dict(baseline_files)
     if include_alpha:
-        alpha_files = {
-            'Low (α=1.0)': ('data/low_Z_alpha1p0.h5', 0.001, 1.0),
-            'Low (α=2.0)': ('data/low_Z_alpha2p0.h5', 0.001, 2.0),
-            'Mid (α=1.0)': ('data/mid_Z_alpha1p0.h5', 0.006, 1.0),
-            'Mid (α=2.0)': ('data/mid_Z_alpha2p0.h5', 0.006, 2.0)
-        }
-        
-        for name, (file, Z, alpha) in alpha_files.items():
+        to_load.update(alpha_files)
+
+    # PyTables releases the GIL around the C-level copy, so reads of the
+    # separate files overlap on a small thread pool; results are collected
+    # in the original order so labelling and log lines are unchanged
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {name: executor.submit(load_results, file, ANALYSIS_COLUMNS)
+                   for name, (file, _, _) in to_load.items()}
+
+        for name, (file, Z, alpha) in baseline_files.items():
             try:
-                df = pd.read_hdf(file, 'results')
-                df['Z_val'] = Z
-                df['alpha_CE'] = alpha
-                df['dataset_name'] = name
-                datasets[name] = df
+                df = futures[name].result()
+                datasets[name] = label_dataset(df, name, Z, alpha)
                 print(f"  ✓ {name}: {len(df)} systems")
-            except FileNotFoundError:
-                print(f"  - {name}: Not found (optional)")
+            except Exception as e:
+                print(f"  ✗ Error loading {file}: {e}")
+
+        if include_alpha:
+            for name, (file, Z, alpha) in alpha_files.items():
+                try:
+                    df = futures[name].result()
+                    datasets[name] = label_dataset(df, name, Z, alpha)
+                    print(f"  ✓ {name}: {len(df)} systems")
+                except FileNotFoundError:
+                    print(f"  - {name}: Not found (optional)")
     
     if len(datasets) == 0:
         print("\n✗ No data files found!")
         exit(1)
-    
+
     return datasets
 
+def build_all_ce(datasets):
+    """Concatenate the CE events from every dataset and classify donors."""
+    # Filter each dataset to its CE events before concatenating, so the
+    # combined frame is allocated once at its final (smaller) size
+    # rather than concatenated in full and then row-copied by the mask
+    all_ce = pd.concat(
+        [df[df['CE_occurred'].to_numpy(dtype=bool)] for df in datasets.values()],
+        ignore_index=True)
+
+    # Categorical codes make every downstream mask/groupby/value_counts on
+    # these columns an int8 compare instead of per-element string compares
+    all_ce['donor_state'] = all_ce['donor_state'].astype('category')
+
+    # Classify donors: donor_state is categorical, so run the classifier
+    # once per unique state and fan the labels out through the codes.
+    # NaN rows have code -1, which picks the trailing 'Unknown' entry.
+    cats = all_ce['donor_state'].cat.categories
+    labels = np.array([classify_donor_type(c) for c in cats] + ['Unknown'])
+    all_ce['donor_type'] = pd.Categorical(
+        labels[all_ce['donor_state'].cat.codes.to_numpy()])
+
+    # Encode the metallicity once following Z_ORDER; every per-Z analysis
+    # reads these int8 codes instead of re-comparing the float column
+    z_vals = all_ce['Z_val'].to_numpy()
+    all_ce['Z_code'] = np.select([z_vals == z for z in Z_ORDER], [0, 1, 2],
+                                 default=-1).astype(np.int8)
+
+    return all_ce
+
+def load_all_ce(include_alpha=False):
+    """Return the combined CE-event frame, via an on-disk cache.
+
+    Building all_ce re-reads every HDF5 file, but the result only changes
+    when a source file does. The finished frame is therefore cached as
+    feather alongside a JSON signature of source-file mtimes; when the
+    signature still matches, the cached frame is loaded directly and the
+    HDF5 files are never opened. The cache is keyed on --include-alpha,
+    which changes the set of source files.
+    """
+    source_files = dict(BASELINE_FILES)
+    if include_alpha:
+        source_files.update(ALPHA_FILES)
+    sig = {file: os.stat(file).st_mtime_ns
+           for file, _, _ in source_files.values() if os.path.exists(file)}
+
+    cache_dir = Path('cache')
+    stem = 'all_ce_alpha' if include_alpha else 'all_ce'
+    cache_file = cache_dir / f'{stem}.feather'
+    sig_file = cache_dir / f'{stem}.sig.json'
+
+    try:
+        if json.loads(sig_file.read_text()) == sig:
+            all_ce = pd.read_feather(cache_file)
+            # Frames cached before the Z_code column existed are rebuilt
+            if 'Z_code' in all_ce.columns:
+                print(f"  ✓ Loaded {len(all_ce)} CE events from cache "
+                      f"({cache_file})")
+                return all_ce
+    except Exception:
+        pass  # no cache yet, stale signature, or unreadable file: rebuild
+
+    all_ce = build_all_ce(load_datasets(include_alpha=include_alpha))
+
+    # Single empty-data guard; everything downstream (including the
+    # figures) can then assume a populated frame
+    if all_ce.empty:
+        print("\n✗ No CE events found in any dataset!")
+        exit(1)
+
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        all_ce.to_feather(cache_file)
+        sig_file.write_text(json.dumps(sig))
+    except Exception:
+        pass  # pyarrow missing or read-only working dir; cache is optional
+    return all_ce
+
 # ============================================================================
 # ANALYSIS 1: Shell vs Core Burning Donors
 # ============================================================================
 
-def analyze_shell_vs_core(datasets):
+def analyze_shell_vs_core(all_ce):
     """Compare survival for shell vs core burning donors."""
     print("\n" + "="*70)
     print("ANALYSIS 1: SHELL vs CORE BURNING DONORS")
     print("="*70)
-    
-    # Combine all CE events
-    all_ce = []
-    for name, df in datasets.items():
-        ce_events = df[df['CE_occurred'] == True].copy()
-        all_ce.append(ce_events)
-    
-    all_ce = pd.concat(all_ce, ignore_index=True)
-    
-    # Classify donors
-    all_ce['donor_type'] = all_ce['donor_state'].apply(classify_donor_type)
-    
+
     print(f"\nTotal CE events: {len(all_ce)}")
     print("\nDonor type distribution:")
     for donor_type in all_ce['donor_type'].value_counts().index:
         count = (all_ce['donor_type'] == donor_type).sum()
         print(f"  {donor_type}: {count}")
     
-    # Analyze by donor type
-    donor_results = []
-    
-    for donor_type in all_ce['donor_type'].unique():
-        type_data = all_ce[all_ce['donor_type'] == donor_type]
-        
-        for Z_val in [0.014, 0.006, 0.001]:
-            Z_type_data = type_data[type_data['Z_val'] == Z_val]
-            
-            if len(Z_type_data) == 0:
-                continue
-            
-            n_total = len(Z_type_data)
-            n_survived = Z_type_data['survived_CE'].sum()
-            survival_rate = n_survived / n_total * 100
-            ci_low, ci_high = wilson_ci(n_survived, n_total)
-            
-            # Lambda statistics
-            lambda_data = Z_type_data['lambda_CE'].dropna()
-            lambda_mean = lambda_data.mean() if len(lambda_data) > 0 else np.nan
-            lambda_std = lambda_data.std() if len(lambda_data) > 0 else np.nan
-            
-            donor_results.append({
-                'Donor_Type': donor_type,
-                'Z': Z_val,
-                'N_CE_Events': n_total,
-                'N_Survived': n_survived,
-                'Survival_Rate_%': survival_rate,
-                'CI_Low_%': ci_low,
-                'CI_High_%': ci_high,
-                'Lambda_Mean': lambda_mean,
-                'Lambda_Std': lambda_std
-            })
-    
-    donor_df = pd.DataFrame(donor_results)
-    donor_df.to_csv(physics_dir / 'shell_vs_core_analysis.csv', index=False)
+    # Analyze by (donor type, metallicity) in a single groupby pass
+    # instead of re-scanning all_ce for every combination
+    grouped = all_ce.groupby(['donor_type', 'Z_val'], sort=False, observed=True)
+    donor_df = grouped.agg(
+        N_CE_Events=('survived_CE', 'size'),
+        N_Survived=('survived_CE', 'sum'),
+        Lambda_Mean=('lambda_CE', 'mean'),
+        Lambda_Std=('lambda_CE', 'std')
+    ).reset_index()
+    donor_df = donor_df.rename(columns={'donor_type': 'Donor_Type', 'Z_val': 'Z'})
+    donor_df['Survival_Rate_%'] = donor_df['N_Survived'] / donor_df['N_CE_Events'] * 100
+    donor_df = donor_df[['Donor_Type', 'Z', 'N_CE_Events', 'N_Survived',
+                         'Survival_Rate_%', 'Lambda_Mean', 'Lambda_Std']]
+
+    # Confidence intervals for all (donor type, Z) rows in one vectorized call
+    ci_low, ci_high = wilson_ci(donor_df['N_Survived'].to_numpy(),
+                                donor_df['N_CE_Events'].to_numpy())
+    donor_df.insert(5, 'CI_Low_%', ci_low)
+    donor_df.insert(6, 'CI_High_%', ci_high)
+    donor_df.to_csv(physics_dir / 'shell_vs_core_analysis.csv', index=False, float_format='%.6g')
     print(f"\n✓ Saved: {physics_dir / 'shell_vs_core_analysis.csv'}")
     
-    # Print summary
-    print("\nSurvival by donor type and metallicity:")
-    for _, row in donor_df.iterrows():
-        print(f"\n{row['Donor_Type']} (Z={row['Z']}):")
-        print(f"  Events: {row['N_CE_Events']}")
-        print(f"  Survival: {row['Survival_Rate_%']:.1f}% (CI: {row['CI_Low_%']:.1f}-{row['CI_High_%']:.1f}%)")
-        print(f"  Lambda: {row['Lambda_Mean']:.3f} ± {row['Lambda_Std']:.3f}")
-    
-    return donor_df, all_ce
+    # Print summary (zip over column arrays; iterrows boxes every value,
+    # and batching the lines keeps it to a single stdout write)
+    report = ["\nSurvival by donor type and metallicity:"]
+    for dt, Z, n_ev, rate, lo, hi, lam_m, lam_s in zip(
+            donor_df['Donor_Type'].to_numpy(), donor_df['Z'].to_numpy(),
+            donor_df['N_CE_Events'].to_numpy(), donor_df['Survival_Rate_%'].to_numpy(),
+            donor_df['CI_Low_%'].to_numpy(), donor_df['CI_High_%'].to_numpy(),
+            donor_df['Lambda_Mean'].to_numpy(), donor_df['Lambda_Std'].to_numpy()):
+        report.append(f"\n{dt} (Z={Z}):")
+        report.append(f"  Events: {n_ev}")
+        report.append(f"  Survival: {rate:.1f}% (CI: {lo:.1f}-{hi:.1f}%)")
+        report.append(f"  Lambda: {lam_m:.3f} ± {lam_s:.3f}")
+    print('\n'.join(report))
+    
+    return donor_df
 
 # ============================================================================
 # ANALYSIS 2: Survival vs Mass Ratio
@@ -221,56 +363,61 @@ def analyze_mass_ratio(all_ce):
     print("ANALYSIS 2: SURVIVAL vs MASS RATIO (q)")
     print("="*70)
     
-    # Define mass ratio bins
-    q_bins = np.linspace(0.4, 1.0, 7)  # 6 bins from 0.4 to 1.0
-    
-    q_results = []
-    
-    for i in range(len(q_bins) - 1):
-        q_min = q_bins[i]
-        q_max = q_bins[i+1]
-        
-        mask = (all_ce['q_initial'] >= q_min) & (all_ce['q_initial'] < q_max)
-        bin_data = all_ce[mask]
-        
-        if len(bin_data) == 0:
-            continue
-        
-        for Z_val in [0.014, 0.006, 0.001]:
-            Z_data = bin_data[bin_data['Z_val'] == Z_val]
-            
-            if len(Z_data) == 0:
-                continue
-            
-            n_total = len(Z_data)
-            n_survived = Z_data['survived_CE'].sum()
-            survival_rate = n_survived / n_total * 100
-            ci_low, ci_high = wilson_ci(n_survived, n_total)
-            
-            q_results.append({
-                'q_min': q_min,
-                'q_max': q_max,
-                'q_center': (q_min + q_max) / 2,
-                'Z': Z_val,
-                'N_Systems': n_total,
-                'N_Survived': n_survived,
-                'Survival_Rate_%': survival_rate,
-                'CI_Low_%': ci_low,
-                'CI_High_%': ci_high
-            })
-    
-    q_df = pd.DataFrame(q_results)
-    q_df.to_csv(physics_dir / 'survival_vs_mass_ratio.csv', index=False)
+    q_bins = Q_BINS
+
+    # Digitize q and encode Z once, then count systems and survivors for
+    # every (q bin, Z) cell with two bincounts — one pass over the data
+    # instead of a boolean mask per cell
+    n_bins = len(q_bins) - 1
+
+    codes = np.digitize(all_ce['q_initial'].to_numpy(), q_bins) - 1
+    surv = all_ce['survived_CE'].to_numpy(dtype=np.int64)
+    z_code = all_ce['Z_code'].to_numpy()
+    ok = (codes >= 0) & (codes < n_bins) & (z_code >= 0)
+
+    flat = codes[ok] * len(Z_ORDER) + z_code[ok]
+    n_cells = np.bincount(flat, minlength=n_bins * len(Z_ORDER))
+    k_cells = np.bincount(flat, weights=surv[ok],
+                          minlength=n_bins * len(Z_ORDER)).astype(np.int64)
+
+    # Emit populated cells in the same (q bin, then Z) order as before;
+    # this walks 18 scalars, not the DataFrame
+    q_rows = []
+    for i in range(n_bins):
+        for j, Z_val in enumerate(Z_ORDER):
+            cell = i * len(Z_ORDER) + j
+            if n_cells[cell] > 0:
+                q_rows.append((q_bins[i], q_bins[i+1], Z_val,
+                               n_cells[cell], k_cells[cell]))
+
+    q_arr = np.array(q_rows, dtype=float)
+    q_df = pd.DataFrame({
+        'q_min': q_arr[:, 0],
+        'q_max': q_arr[:, 1],
+        'q_center': (q_arr[:, 0] + q_arr[:, 1]) / 2,
+        'Z': q_arr[:, 2],
+        'N_Systems': q_arr[:, 3].astype(np.int64),
+        'N_Survived': q_arr[:, 4].astype(np.int64),
+        'Survival_Rate_%': q_arr[:, 4] / q_arr[:, 3] * 100
+    })
+    ci_low, ci_high = wilson_ci(q_df['N_Survived'].to_numpy(),
+                                q_df['N_Systems'].to_numpy())
+    q_df['CI_Low_%'] = ci_low
+    q_df['CI_High_%'] = ci_high
+    q_df.to_csv(physics_dir / 'survival_vs_mass_ratio.csv', index=False, float_format='%.6g')
     print(f"\n✓ Saved: {physics_dir / 'survival_vs_mass_ratio.csv'}")
     
-    print("\nSurvival vs mass ratio:")
-    for Z_val in [0.014, 0.006, 0.001]:
+    report = ["\nSurvival vs mass ratio:"]
+    for Z_val in Z_ORDER:
         Z_data = q_df[q_df['Z'] == Z_val]
         if len(Z_data) > 0:
-            print(f"\nZ = {Z_val}:")
-            for _, row in Z_data.iterrows():
-                print(f"  q ∈ [{row['q_min']:.2f}, {row['q_max']:.2f}]: "
-                      f"{row['Survival_Rate_%']:.1f}% (n={row['N_Systems']})")
+            report.append(f"\nZ = {Z_val}:")
+            for q_min, q_max, rate, n in zip(
+                    Z_data['q_min'].to_numpy(), Z_data['q_max'].to_numpy(),
+                    Z_data['Survival_Rate_%'].to_numpy(), Z_data['N_Systems'].to_numpy()):
+                report.append(f"  q ∈ [{q_min:.2f}, {q_max:.2f}]: "
+                              f"{rate:.1f}% (n={n})")
+    print('\n'.join(report))
     
     return q_df
 
@@ -284,56 +431,60 @@ def analyze_orbital_period(all_ce):
     print("ANALYSIS 3: SURVIVAL vs ORBITAL PERIOD")
     print("="*70)
     
-    # Define period bins (log-spaced)
-    P_bins = np.logspace(np.log10(50), np.log10(5000), 7)
-    
-    P_results = []
-    
-    for i in range(len(P_bins) - 1):
-        P_min = P_bins[i]
-        P_max = P_bins[i+1]
-        
-        mask = (all_ce['P_initial'] >= P_min) & (all_ce['P_initial'] < P_max)
-        bin_data = all_ce[mask]
-        
-        if len(bin_data) == 0:
-            continue
-        
-        for Z_val in [0.014, 0.006, 0.001]:
-            Z_data = bin_data[bin_data['Z_val'] == Z_val]
-            
-            if len(Z_data) == 0:
-                continue
-            
-            n_total = len(Z_data)
-            n_survived = Z_data['survived_CE'].sum()
-            survival_rate = n_survived / n_total * 100
-            ci_low, ci_high = wilson_ci(n_survived, n_total)
-            
-            P_results.append({
-                'P_min': P_min,
-                'P_max': P_max,
-                'P_center': np.sqrt(P_min * P_max),  # Geometric mean
-                'Z': Z_val,
-                'N_Systems': n_total,
-                'N_Survived': n_survived,
-                'Survival_Rate_%': survival_rate,
-                'CI_Low_%': ci_low,
-                'CI_High_%': ci_high
-            })
-    
-    P_df = pd.DataFrame(P_results)
-    P_df.to_csv(physics_dir / 'survival_vs_period.csv', index=False)
+    P_bins = P_BINS
+
+    # Same two-bincount build as the mass-ratio analysis: digitize P and
+    # encode Z once, then count systems and survivors for every
+    # (P bin, Z) cell in a single pass instead of a mask per cell
+    n_bins = len(P_bins) - 1
+
+    codes = np.digitize(all_ce['P_initial'].to_numpy(), P_bins) - 1
+    surv = all_ce['survived_CE'].to_numpy(dtype=np.int64)
+    z_code = all_ce['Z_code'].to_numpy()
+    ok = (codes >= 0) & (codes < n_bins) & (z_code >= 0)
+
+    flat = codes[ok] * len(Z_ORDER) + z_code[ok]
+    n_cells = np.bincount(flat, minlength=n_bins * len(Z_ORDER))
+    k_cells = np.bincount(flat, weights=surv[ok],
+                          minlength=n_bins * len(Z_ORDER)).astype(np.int64)
+
+    # Emit populated cells in the original (P bin, then Z) order
+    P_rows = []
+    for i in range(n_bins):
+        for j, Z_val in enumerate(Z_ORDER):
+            cell = i * len(Z_ORDER) + j
+            if n_cells[cell] > 0:
+                P_rows.append((P_bins[i], P_bins[i+1], Z_val,
+                               n_cells[cell], k_cells[cell]))
+
+    P_arr = np.array(P_rows, dtype=float)
+    P_df = pd.DataFrame({
+        'P_min': P_arr[:, 0],
+        'P_max': P_arr[:, 1],
+        'P_center': np.sqrt(P_arr[:, 0] * P_arr[:, 1]),  # Geometric mean
+        'Z': P_arr[:, 2],
+        'N_Systems': P_arr[:, 3].astype(np.int64),
+        'N_Survived': P_arr[:, 4].astype(np.int64),
+        'Survival_Rate_%': P_arr[:, 4] / P_arr[:, 3] * 100
+    })
+    ci_low, ci_high = wilson_ci(P_df['N_Survived'].to_numpy(),
+                                P_df['N_Systems'].to_numpy())
+    P_df['CI_Low_%'] = ci_low
+    P_df['CI_High_%'] = ci_high
+    P_df.to_csv(physics_dir / 'survival_vs_period.csv', index=False, float_format='%.6g')
     print(f"\n✓ Saved: {physics_dir / 'survival_vs_period.csv'}")
     
-    print("\nSurvival vs orbital period:")
-    for Z_val in [0.014, 0.006, 0.001]:
+    report = ["\nSurvival vs orbital period:"]
+    for Z_val in Z_ORDER:
         Z_data = P_df[P_df['Z'] == Z_val]
         if len(Z_data) > 0:
-            print(f"\nZ = {Z_val}:")
-            for _, row in Z_data.iterrows():
-                print(f"  P ∈ [{row['P_min']:.0f}, {row['P_max']:.0f}] days: "
-                      f"{row['Survival_Rate_%']:.1f}% (n={row['N_Systems']})")
+            report.append(f"\nZ = {Z_val}:")
+            for P_min, P_max, rate, n in zip(
+                    Z_data['P_min'].to_numpy(), Z_data['P_max'].to_numpy(),
+                    Z_data['Survival_Rate_%'].to_numpy(), Z_data['N_Systems'].to_numpy()):
+                report.append(f"  P ∈ [{P_min:.0f}, {P_max:.0f}] days: "
+                              f"{rate:.1f}% (n={n})")
+    print('\n'.join(report))
     
     return P_df
 
@@ -347,42 +498,40 @@ def create_2d_survival_maps(all_ce):
     print("ANALYSIS 4: 2D SURVIVAL MAPS")
     print("="*70)
     
-    # Define 2D grid
-    q_bins = np.linspace(0.4, 1.0, 8)
-    P_bins = np.logspace(np.log10(50), np.log10(5000), 8)
-    
+    q_bins = MAP_Q_BINS
+    P_bins = MAP_P_BINS
+
+    # Pull the columns out once; each metallicity panel then indexes these
+    # arrays through the shared Z codes instead of re-scanning the DataFrame
+    q_all = all_ce['q_initial'].to_numpy()
+    P_all = all_ce['P_initial'].to_numpy()
+    surv_all = all_ce['survived_CE'].to_numpy(dtype=np.int64)
+    z_code = all_ce['Z_code'].to_numpy()
+
     # Create figure with subplots for each metallicity
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
-    
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5), constrained_layout=True)
+
+    # Panel order matches Z_ORDER, so the enumeration index is the Z code
     for idx, (Z_val, Z_label) in enumerate([(0.014, 'Solar'), (0.006, 'Mid'), (0.001, 'Low')]):
-        Z_data = all_ce[all_ce['Z_val'] == Z_val]
-        
-        # Create 2D histogram
-        survival_map = np.zeros((len(q_bins)-1, len(P_bins)-1))
-        count_map = np.zeros((len(q_bins)-1, len(P_bins)-1))
-        
-        for i in range(len(q_bins) - 1):
-            for j in range(len(P_bins) - 1):
-                mask = ((Z_data['q_initial'] >= q_bins[i]) & 
-                       (Z_data['q_initial'] < q_bins[i+1]) &
-                       (Z_data['P_initial'] >= P_bins[j]) & 
-                       (Z_data['P_initial'] < P_bins[j+1]))
-                
-                bin_data = Z_data[mask]
-                count_map[i, j] = len(bin_data)
-                
-                if len(bin_data) > 0:
-                    survival_map[i, j] = bin_data['survived_CE'].sum() / len(bin_data) * 100
-                else:
-                    survival_map[i, j] = np.nan
-        
-        # Smooth for visualization (only where we have data)
-        survival_map_smooth = survival_map.copy()
-        mask_valid = ~np.isnan(survival_map)
-        if mask_valid.sum() > 0:
-            survival_map_smooth[mask_valid] = gaussian_filter(
-                survival_map[mask_valid].reshape(-1), sigma=0.5
-            ).reshape(-1)
+        zm = z_code == idx
+        q = q_all[zm]
+        P = P_all[zm]
+        surv = surv_all[zm]
+
+        # Two histogram2d passes (counts, then survivor-weighted) replace
+        # the per-cell boolean masks: one C-level scan of each column
+        # instead of one scan per (q, P) cell. The loop treated every bin
+        # as half-open, so points sitting exactly on the top edges are
+        # dropped up front to keep histogram2d's closed last bin matching.
+        sel = (q < q_bins[-1]) & (P < P_bins[-1])
+        count_map, _, _ = np.histogram2d(q[sel], P[sel],
+                                         bins=[q_bins, P_bins])
+        survivors, _, _ = np.histogram2d(q[sel], P[sel],
+                                         bins=[q_bins, P_bins],
+                                         weights=surv[sel].astype(np.float64))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            survival_map = np.where(count_map > 0,
+                                    survivors / count_map * 100, np.nan)
         
         # Plot
         ax = axes[idx]
@@ -411,8 +560,8 @@ def create_2d_survival_maps(all_ce):
                            ha='center', va='center', fontsize=8, 
                            color='white' if survival_map[i, j] < 50 else 'black')
     
-    plt.tight_layout()
-    plt.savefig(physics_dir / '2d_survival_maps.png', dpi=300, bbox_inches='tight')
+    plt.savefig(physics_dir / '2d_survival_maps.png', dpi=FIG_DPI)
+    plt.close(fig)
     print(f"\n✓ Saved: {physics_dir / '2d_survival_maps.png'}")
 
 # ============================================================================
@@ -425,39 +574,38 @@ def create_physics_figures(donor_df, q_df, P_df):
     print("GENERATING FIGURES")
     print("="*70)
     
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10), constrained_layout=True)
     
     # Plot 1: Shell vs Core survival
     ax = axes[0, 0]
     donor_types = ['Shell H Burning', 'Shell He Burning', 'Core H Burning', 'Core He Burning']
     plot_data = donor_df[donor_df['Donor_Type'].isin(donor_types)]
-    
-    if len(plot_data) > 0:
-        x_pos = np.arange(len(donor_types))
-        width = 0.25
-        
-        for i, (Z_val, color, label) in enumerate([(0.014, 'orange', 'Solar'),
-                                                     (0.006, 'blue', 'Mid'),
-                                                     (0.001, 'purple', 'Low')]):
-            Z_data = plot_data[plot_data['Z'] == Z_val]
-            survival_rates = [
-                Z_data[Z_data['Donor_Type'] == dt]['Survival_Rate_%'].values[0] 
-                if len(Z_data[Z_data['Donor_Type'] == dt]) > 0 else 0
-                for dt in donor_types
-            ]
-            
-            offset = (i - 1) * width
-            ax.bar(x_pos + offset, survival_rates, width, label=f'{label} Z',
-                  color=color, alpha=0.7, edgecolor='black', linewidth=1.5)
-        
-        ax.set_xlabel('Donor Evolutionary State', fontsize=12, weight='bold')
-        ax.set_ylabel('Survival Rate (%)', fontsize=12, weight='bold')
-        ax.set_title('Shell vs Core Burning Donors', fontsize=14, weight='bold')
-        ax.set_xticks(x_pos)
-        ax.set_xticklabels([dt.replace(' Burning', '') for dt in donor_types], 
-                          rotation=45, ha='right', fontsize=10)
-        ax.legend(fontsize=10)
-        ax.grid(True, alpha=0.3, axis='y')
+
+    x_pos = np.arange(len(donor_types))
+    width = 0.25
+
+    # Precompute the (Z, donor type) survival matrix once; each bar
+    # call below just reads a row instead of re-filtering the frame
+    rate_grid = plot_data.pivot_table(index='Z', columns='Donor_Type',
+                                      values='Survival_Rate_%', aggfunc='first')
+    rate_grid = rate_grid.reindex(index=Z_ORDER,
+                                  columns=donor_types).fillna(0).to_numpy()
+
+    for i, (Z_val, color, label) in enumerate([(0.014, 'orange', 'Solar'),
+                                                 (0.006, 'blue', 'Mid'),
+                                                 (0.001, 'purple', 'Low')]):
+        offset = (i - 1) * width
+        ax.bar(x_pos + offset, rate_grid[i], width, label=f'{label} Z',
+              color=color, alpha=0.7, edgecolor='black', linewidth=1.5)
+
+    ax.set_xlabel('Donor Evolutionary State', fontsize=12, weight='bold')
+    ax.set_ylabel('Survival Rate (%)', fontsize=12, weight='bold')
+    ax.set_title('Shell vs Core Burning Donors', fontsize=14, weight='bold')
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels([dt.replace(' Burning', '') for dt in donor_types],
+                      rotation=45, ha='right', fontsize=10)
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3, axis='y')
     
     # Plot 2: Survival vs Mass Ratio
     ax = axes[0, 1]
@@ -496,34 +644,31 @@ def create_physics_figures(donor_df, q_df, P_df):
     # Plot 4: Lambda by donor type
     ax = axes[1, 1]
     plot_data = donor_df[donor_df['Donor_Type'].isin(donor_types)]
+
+    x_pos = np.arange(len(donor_types))
+
+    # Average lambda across metallicities in one grouped pass
+    lam_grid = (plot_data.groupby('Donor_Type')[['Lambda_Mean', 'Lambda_Std']]
+                .mean().reindex(donor_types))
+    lambda_means = lam_grid['Lambda_Mean'].to_numpy()
+    lambda_stds = lam_grid['Lambda_Std'].to_numpy()
+
+    ax.bar(x_pos, lambda_means, color='steelblue', alpha=0.7,
+          edgecolor='black', linewidth=2, yerr=lambda_stds, capsize=6)
+    ax.axhline(0.5, color='red', linestyle='--', linewidth=2,
+              label='Classical: λ=0.5', alpha=0.7)
+
+    ax.set_xlabel('Donor Evolutionary State', fontsize=12, weight='bold')
+    ax.set_ylabel('Mean Lambda (λ)', fontsize=12, weight='bold')
+    ax.set_title('Lambda by Donor Type', fontsize=14, weight='bold')
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels([dt.replace(' Burning', '') for dt in donor_types],
+                      rotation=45, ha='right', fontsize=10)
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3, axis='y')
     
-    if len(plot_data) > 0:
-        x_pos = np.arange(len(donor_types))
-        
-        # Average lambda across metallicities
-        lambda_means = []
-        lambda_stds = []
-        for dt in donor_types:
-            dt_data = plot_data[plot_data['Donor_Type'] == dt]
-            lambda_means.append(dt_data['Lambda_Mean'].mean())
-            lambda_stds.append(dt_data['Lambda_Std'].mean())
-        
-        ax.bar(x_pos, lambda_means, color='steelblue', alpha=0.7,
-              edgecolor='black', linewidth=2, yerr=lambda_stds, capsize=6)
-        ax.axhline(0.5, color='red', linestyle='--', linewidth=2, 
-                  label='Classical: λ=0.5', alpha=0.7)
-        
-        ax.set_xlabel('Donor Evolutionary State', fontsize=12, weight='bold')
-        ax.set_ylabel('Mean Lambda (λ)', fontsize=12, weight='bold')
-        ax.set_title('Lambda by Donor Type', fontsize=14, weight='bold')
-        ax.set_xticks(x_pos)
-        ax.set_xticklabels([dt.replace(' Burning', '') for dt in donor_types],
-                          rotation=45, ha='right', fontsize=10)
-        ax.legend(fontsize=10)
-        ax.grid(True, alpha=0.3, axis='y')
-    
-    plt.tight_layout()
-    plt.savefig(physics_dir / 'physics_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig(physics_dir / 'physics_analysis.png', dpi=FIG_DPI)
+    plt.close(fig)
     print(f"✓ Saved: {physics_dir / 'physics_analysis.png'}")
 
 # ============================================================================
@@ -540,10 +685,10 @@ def main():
     args = parser.parse_args()
     
     # Load data
-    datasets = load_datasets(include_alpha=args.include_alpha)
-    
+    all_ce = load_all_ce(include_alpha=args.include_alpha)
+
     # Run analyses
-    donor_df, all_ce = analyze_shell_vs_core(datasets)
+    donor_df = analyze_shell_vs_core(all_ce)
     q_df = analyze_mass_ratio(all_ce)
     P_df = analyze_orbital_period(all_ce)
     create_2d_survival_maps(all_ce)
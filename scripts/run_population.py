@@ -11,6 +11,8 @@ Usage:
 import argparse
 import numpy as np
 import pandas as pd
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
 import os
@@ -49,24 +51,23 @@ def create_binary_grid(M1_range, M2_range, P_range, metallicities, n_samples=Non
     # Generate grids
     M1_grid = np.linspace(*M1_range)
     M2_grid = np.linspace(*M2_range)
-    P_grid = np.logspace(np.log10(P_range[0]), np.log10(P_range[1]), P_range[2])
-    
-    binary_list = []
-    
-    for Z in metallicities:
-        for M1 in M1_grid:
-            for M2 in M2_grid:
-                if M1 >= M2:  # Primary more massive
-                    for P in P_grid:
-                        binary_list.append({
-                            'M1': M1,
-                            'M2': M2,
-                            'P_orb': P,
-                            'Z': Z,
-                            'q': M2/M1,
-                        })
-    
-    df = pd.DataFrame(binary_list)
+    # geomspace takes the endpoints directly, skipping the log10 round-trip
+    P_grid = np.geomspace(P_range[0], P_range[1], P_range[2])
+
+    # Broadcast the Cartesian product instead of nested Python loops;
+    # indexing='ij' keeps the same (Z, M1, M2, P) row order as before
+    Z, M1, M2, P = np.meshgrid(np.asarray(metallicities, dtype=float),
+                               M1_grid, M2_grid, P_grid, indexing='ij')
+    mask = (M1 >= M2).ravel()  # Primary more massive
+    M1, M2, P, Z = M1.ravel()[mask], M2.ravel()[mask], P.ravel()[mask], Z.ravel()[mask]
+
+    df = pd.DataFrame({
+        'M1': M1,
+        'M2': M2,
+        'P_orb': P,
+        'Z': Z,
+        'q': M2 / M1,
+    })
     
     # Random sampling if requested
     if n_samples and n_samples < len(df):
@@ -106,6 +107,44 @@ def setup_simulation_properties(metallicity=0.014, alpha_CE=1.0):
     return sim_prop
 
 
+def load_steps_cached(sim_prop, alpha_CE=1.0, verbose=True):
+    """
+    Load POSYDON steps, reusing a pickled copy when parameters are unchanged.
+
+    load_steps() re-parses the MESA grids and rebuilds interpolators
+    (2-5 minutes); a joblib dump of the initialized SimulationProperties
+    loads back in seconds. The cache is invalidated whenever
+    population_params.ini is newer than the dump.
+    """
+    cache_file = Path('.cache') / f'sim_prop_alpha{alpha_CE}.joblib'
+    params_file = Path('./population_params.ini')
+
+    if cache_file.exists() and (not params_file.exists() or
+                                cache_file.stat().st_mtime > params_file.stat().st_mtime):
+        try:
+            import joblib
+            if verbose:
+                print(f"Loading cached POSYDON steps from {cache_file}...")
+            return joblib.load(cache_file)
+        except Exception as e:
+            if verbose:
+                print(f"⚠ Step cache unusable ({e}), reloading steps")
+
+    sim_prop.load_steps(verbose=verbose)
+
+    try:
+        import joblib
+        cache_file.parent.mkdir(exist_ok=True)
+        joblib.dump(sim_prop, cache_file)
+        if verbose:
+            print(f"Cached loaded steps to {cache_file}")
+    except Exception as e:
+        if verbose:
+            print(f"⚠ Could not cache steps: {e}")
+
+    return sim_prop
+
+
 def evolve_binary(M1, M2, P_orb, Z, sim_prop):
     """
     Evolve a single binary system using correct POSYDON API.
@@ -149,50 +188,54 @@ def extract_CE_data(binary, initial_conditions):
         'final_M1': np.nan,
         'final_M2': np.nan,
         'final_P': np.nan,
+        'error': None,
     }
-    
-    # Extract final state information
+
+    # Extract final state information: one EAFP block instead of a
+    # hasattr ladder (six dynamic lookups per binary before any value)
     try:
-        if hasattr(binary, 'star_1') and hasattr(binary.star_1, 'mass'):
-            ce_data['final_M1'] = binary.star_1.mass
-        if hasattr(binary, 'star_2') and hasattr(binary.star_2, 'mass'):
-            ce_data['final_M2'] = binary.star_2.mass
-        if hasattr(binary, 'orbital_period'):
-            ce_data['final_P'] = binary.orbital_period
-    except:
+        ce_data['final_M1'] = binary.star_1.mass
+        ce_data['final_M2'] = binary.star_2.mass
+        ce_data['final_P'] = binary.orbital_period
+    except AttributeError:
         pass
-    
+
     # Check for CE events in the binary's event history
     try:
         # POSYDON stores history as a pandas DataFrame accessible via to_df()
-        if hasattr(binary, 'to_df'):
-            history_df = binary.to_df()
-            
-            # Look for CE events in the 'event' column
-            if 'event' in history_df.columns:
-                ce_events = history_df[history_df['event'].str.contains('CE', na=False)]
-                
-                if len(ce_events) > 0:
-                    ce_data['CE_occurred'] = True
-                    
-                    # Get first CE event
-                    ce_row = ce_events.iloc[0]
-                    
-                    # Extract lambda from primary star (use 10cent as standard)
-                    # Lambda columns: S1_lambda_CE_1cent, S1_lambda_CE_10cent, S1_lambda_CE_30cent
-                    if 'S1_lambda_CE_10cent' in history_df.columns:
-                        lambda_val = ce_row.get('S1_lambda_CE_10cent', np.nan)
-                        if not np.isnan(lambda_val):
-                            ce_data['lambda_CE'] = lambda_val
-                    
-                    # Extract donor state (which star overflowed first)
-                    # Typically star_1 is the donor in first CE
-                    if 'S1_state' in history_df.columns:
-                        ce_data['donor_state'] = str(ce_row.get('S1_state', 'unknown'))
-                    
-                    # Check if system survived CE
-                    ce_data['survived_CE'] = binary.state not in ['merged', 'initial_RLOF', 'disrupted']
-        
+        history_df = binary.to_df()
+
+        # Look for CE events in the 'event' column
+        if 'event' in history_df.columns:
+            # Substring-check the few unique event labels, then broadcast
+            # through the codes — O(#categories) scans instead of O(#rows)
+            events = history_df['event'].astype('category')
+            cat_is_ce = np.asarray(events.cat.categories.str.contains('CE', regex=False))
+            codes = events.cat.codes.to_numpy()
+            ce_mask = (codes >= 0) & cat_is_ce[codes]
+
+            if ce_mask.any():
+                ce_data['CE_occurred'] = True
+
+                # Index the first CE row directly; slicing a sub-frame
+                # just to take .iloc[0] copies every matching row
+                first_ce = int(np.argmax(ce_mask))
+
+                # Extract lambda from primary star (use 10cent as standard)
+                # Lambda columns: S1_lambda_CE_1cent, S1_lambda_CE_10cent, S1_lambda_CE_30cent
+                if 'S1_lambda_CE_10cent' in history_df.columns:
+                    lambda_val = history_df['S1_lambda_CE_10cent'].iloc[first_ce]
+                    if not np.isnan(lambda_val):
+                        ce_data['lambda_CE'] = lambda_val
+
+                # Extract donor state (which star overflowed first)
+                # Typically star_1 is the donor in first CE
+                if 'S1_state' in history_df.columns:
+                    ce_data['donor_state'] = str(history_df['S1_state'].iloc[first_ce])
+
+                # Check if system survived CE
+                ce_data['survived_CE'] = binary.state not in ['merged', 'initial_RLOF', 'disrupted']
+
     except Exception as e:
         # Silently fail - not all binaries will have CE events
         pass
@@ -200,10 +243,125 @@ def extract_CE_data(binary, initial_conditions):
     return ce_data
 
 
-def run_population(binary_grid, output_file, alpha_CE=1.0, verbose=True):
+# Per-worker SimulationProperties: each worker process loads the POSYDON
+# grids once at startup and keeps them in this module global, so the
+# multi-GB grid data is never pickled per task
+_worker_sim_prop = None
+_worker_alpha = None
+
+# Memo of extracted records keyed by rounded initial conditions (+alpha):
+# exact-duplicate systems show up in re-sampled and swept grids, and a
+# dict hit replaces a multi-second MESA interpolation
+_evolve_cache = {}
+
+
+def _init_worker(alpha_CE):
+    """Load POSYDON grids once in a freshly spawned worker process."""
+    global _worker_sim_prop, _worker_alpha
+    sim_prop = setup_simulation_properties(alpha_CE=alpha_CE)
+    _worker_sim_prop = load_steps_cached(sim_prop, alpha_CE=alpha_CE, verbose=False)
+    _worker_alpha = alpha_CE
+
+
+def _evolve_record(M1, M2, P_orb, Z, q, alpha_CE, sim_prop):
+    """Evolve one binary and extract its record, memoized per process.
+
+    alpha_CE is part of the key because it changes the CE outcome for
+    otherwise identical initial conditions.
+    """
+    key = (round(float(M1), 4), round(float(M2), 4),
+           round(float(P_orb), 4), round(float(Z), 6), float(alpha_CE))
+    record = _evolve_cache.get(key)
+    if record is None:
+        binary = evolve_binary(M1=M1, M2=M2, P_orb=P_orb, Z=Z, sim_prop=sim_prop)
+        record = extract_CE_data(
+            binary, {'M1': M1, 'M2': M2, 'P_orb': P_orb, 'Z': Z, 'q': q})
+        _evolve_cache[key] = record
+    return record
+
+
+def _error_record(row, error):
+    """Full-schema record for a failed evolution (flags down, error kept).
+
+    Keeping the schema identical to successful records lets chunks with
+    and without failures append to the same HDF5 table. The message is
+    truncated to fit the table's fixed string width.
+    """
+    return {
+        'M1_initial': row['M1'],
+        'M2_initial': row['M2'],
+        'P_initial': row['P_orb'],
+        'Z': row['Z'],
+        'q_initial': row['q'],
+        'CE_occurred': False,
+        'lambda_CE': np.nan,
+        'donor_state': None,
+        'survived_CE': False,
+        'final_state': None,
+        'final_M1': np.nan,
+        'final_M2': np.nan,
+        'final_P': np.nan,
+        'error': str(error)[:240],
+    }
+
+
+def _evolve_one(row):
+    """Picklable worker: evolve one binary and return its CE record.
+
+    row is a plain (M1, M2, P_orb, Z, q) tuple — cheaper to build and
+    pickle per task than a dict or Series.
+    """
+    M1, M2, P_orb, Z, q = row
+    try:
+        return _evolve_record(M1, M2, P_orb, Z, q, _worker_alpha, _worker_sim_prop)
+    except Exception as e:
+        return _error_record({'M1': M1, 'M2': M2, 'P_orb': P_orb, 'Z': Z, 'q': q}, e)
+
+
+# Output table schema with fixed per-column dtypes; string columns need
+# a fixed width for appends
+_COLUMN_DTYPES = {
+    'M1_initial': np.float64,
+    'M2_initial': np.float64,
+    'P_initial': np.float64,
+    'Z': np.float64,
+    'q_initial': np.float64,
+    'CE_occurred': np.bool_,
+    'lambda_CE': np.float64,
+    'donor_state': object,
+    'survived_CE': np.bool_,
+    'final_state': object,
+    'final_M1': np.float64,
+    'final_M2': np.float64,
+    'final_P': np.float64,
+    'error': object,
+}
+_STRING_MIN_ITEMSIZE = {'donor_state': 64, 'final_state': 64, 'error': 256}
+
+
+def _append_chunk(store, buf):
+    """Append buffered records to the results table and clear the buffer.
+
+    Each column is materialized straight into an array of its declared
+    dtype (structure-of-arrays), so pandas never runs row-wise dtype
+    inference over the dicts and the boolean flags stay packed.
+    """
+    chunk = pd.DataFrame({
+        col: (np.array([rec[col] for rec in buf], dtype=object)
+              if dtype is object else
+              np.fromiter((rec[col] for rec in buf), dtype=dtype, count=len(buf)))
+        for col, dtype in _COLUMN_DTYPES.items()
+    })
+    store.append('results', chunk, format='table', index=False,
+                 data_columns=['CE_occurred', 'Z', 'survived_CE'],
+                 min_itemsize=_STRING_MIN_ITEMSIZE)
+    buf.clear()
+
+
+def run_population(binary_grid, output_file, alpha_CE=1.0, verbose=True, n_jobs=1):
     """
     Run population synthesis on binary grid.
-    
+
     Parameters:
     -----------
     binary_grid : DataFrame
@@ -214,54 +372,104 @@ def run_population(binary_grid, output_file, alpha_CE=1.0, verbose=True):
         Common envelope efficiency parameter
     verbose : bool
         Print progress
+    n_jobs : int
+        Worker processes for the evolution loop (1 = sequential,
+        -1 = all cores). Each binary.evolve() is an independent
+        CPU-bound interpolation, so the loop parallelizes cleanly;
+        every worker holds its own copy of the loaded grids.
     """
-    results = []
-    
-    # Setup simulation properties (do this once)
-    if verbose:
-        print("Loading simulation properties and POSYDON grids...")
-        print("(This takes 2-5 minutes on first run)\n")
-    
-    sim_prop = setup_simulation_properties(alpha_CE=alpha_CE)
-    
-    # Load steps once (not per binary!)
-    if verbose:
-        print("Loading POSYDON steps...")
-    sim_prop.load_steps(verbose=verbose)
-    if verbose:
-        print("✅ Steps loaded! Starting evolution...\n")
-    
-    iterator = tqdm(binary_grid.iterrows(), total=len(binary_grid)) if verbose else binary_grid.iterrows()
-    
-    for idx, row in iterator:
-        try:
-            # Evolve binary
-            binary = evolve_binary(
-                M1=row['M1'],
-                M2=row['M2'],
-                P_orb=row['P_orb'],
-                Z=row['Z'],
-                sim_prop=sim_prop
-            )
-            
-            # Extract data
-            ce_data = extract_CE_data(binary, row)
-            results.append(ce_data)
-            
-        except Exception as e:
+    # Raw C-tuples per row: itertuples skips the per-row Series boxing
+    # of iterrows and the per-row dict of to_dict(orient='records')
+    rows = list(binary_grid[['M1', 'M2', 'P_orb', 'Z', 'q']]
+                .itertuples(index=False, name=None))
+
+    # Records stream into the compressed table store in fixed-size
+    # chunks: memory stays O(chunk) instead of one dict per binary, and
+    # a crash mid-run loses at most the current buffer. Table format
+    # with blosc:lz4 keeps the file chunked and compressed, and lets
+    # the analysis scripts read column subsets and chunks.
+    flush_every = 1024
+
+    def stream_to_store(record_iter):
+        with pd.HDFStore(output_file, mode='w',
+                         complib='blosc:lz4', complevel=5) as store:
+            buf = []
+            for record in record_iter:
+                buf.append(record)
+                if len(buf) >= flush_every:
+                    _append_chunk(store, buf)
+            if buf:
+                _append_chunk(store, buf)
+
+    if n_jobs != 1:
+        global _worker_sim_prop, _worker_alpha
+        max_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+        chunksize = max(1, len(rows) // (4 * max_workers))
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # Load the grids once in the parent: forked workers inherit
+            # the module global copy-on-write, so the multi-GB tables
+            # stay single-copy in RAM and workers start instantly
             if verbose:
-                print(f"\nError at index {idx}: {e}")
-            results.append({
-                'M1_initial': row['M1'],
-                'M2_initial': row['M2'],
-                'P_initial': row['P_orb'],
-                'Z': row['Z'],
-                'error': str(e)
-            })
-    
-    # Save results
-    results_df = pd.DataFrame(results)
-    results_df.to_hdf(output_file, key='results', mode='w')
+                print(f"Evolving {len(rows)} binaries on {max_workers} worker processes...")
+                print("(Workers share the parent's loaded POSYDON grids)\n")
+            sim_prop = setup_simulation_properties(alpha_CE=alpha_CE)
+            _worker_sim_prop = load_steps_cached(sim_prop, alpha_CE=alpha_CE,
+                                                 verbose=verbose)
+            _worker_alpha = alpha_CE
+            pool_kwargs = {'mp_context': multiprocessing.get_context('fork')}
+        else:
+            # No fork (e.g. Windows): each worker loads its own copy
+            if verbose:
+                print(f"Evolving {len(rows)} binaries on {max_workers} worker processes...")
+                print("(Each worker loads the POSYDON grids once at startup)\n")
+            pool_kwargs = {'initializer': _init_worker, 'initargs': (alpha_CE,)}
+
+        with ProcessPoolExecutor(max_workers=max_workers, **pool_kwargs) as executor:
+            mapped = executor.map(_evolve_one, rows, chunksize=chunksize)
+            if verbose:
+                mapped = tqdm(mapped, total=len(rows), mininterval=0.5,
+                              miniters=max(1, len(rows) // 200))
+            stream_to_store(mapped)
+    else:
+        # Setup simulation properties (do this once)
+        if verbose:
+            print("Loading simulation properties and POSYDON grids...")
+            print("(This takes 2-5 minutes on first run)\n")
+
+        sim_prop = setup_simulation_properties(alpha_CE=alpha_CE)
+
+        # Load steps once (not per binary!), from the disk cache when possible
+        if verbose:
+            print("Loading POSYDON steps...")
+        sim_prop = load_steps_cached(sim_prop, alpha_CE=alpha_CE, verbose=verbose)
+        if verbose:
+            print("✅ Steps loaded! Starting evolution...\n")
+
+        def evolve_sequentially():
+            # The bar is updated in batches of 128 rather than wrapping
+            # the iterator, so fast (cached or failing) evolutions don't
+            # pay two extra frame crossings per binary
+            pbar = tqdm(total=len(rows), mininterval=0.5,
+                        miniters=max(1, len(rows) // 200)) if verbose else None
+            for idx, (M1, M2, P_orb, Z, q) in enumerate(rows):
+                try:
+                    yield _evolve_record(M1, M2, P_orb, Z, q, alpha_CE, sim_prop)
+                except Exception as e:
+                    if verbose:
+                        print(f"\nError at index {idx}: {e}")
+                    yield _error_record(
+                        {'M1': M1, 'M2': M2, 'P_orb': P_orb, 'Z': Z, 'q': q}, e)
+                if pbar is not None and (idx & 0x7F) == 0x7F:
+                    pbar.update(128)
+            if pbar is not None:
+                pbar.update(len(rows) % 128)
+                pbar.close()
+
+        stream_to_store(evolve_sequentially())
+
+    # Read back once for the summary and the return value
+    results_df = pd.read_hdf(output_file, 'results')
     
     if verbose:
         print(f"\nResults saved to {output_file}")
@@ -269,15 +477,16 @@ def run_population(binary_grid, output_file, alpha_CE=1.0, verbose=True):
         
         # Check if CE_occurred column exists and has data
         if 'CE_occurred' in results_df.columns:
-            # Use == True to handle NaN values properly
-            ce_systems = results_df[results_df['CE_occurred'] == True]
-            ce_count = len(ce_systems)
+            # Reductions run on raw arrays extracted once; count_nonzero
+            # and the masked mean compile down to single C loops
+            ce_arr = results_df['CE_occurred'].to_numpy(dtype=bool)
+            ce_count = int(np.count_nonzero(ce_arr))
             print(f"Systems with CE events: {ce_count}")
             if ce_count > 0 and 'survived_CE' in results_df.columns:
-                # Filter out NaN values in survived_CE
-                valid_survival = ce_systems['survived_CE'].dropna()
-                if len(valid_survival) > 0:
-                    print(f"CE survival rate: {valid_survival.mean():.2%}")
+                # Single NaN scan instead of dropna() followed by mean()
+                survival = results_df['survived_CE'].to_numpy(dtype=float)[ce_arr]
+                if np.isfinite(survival).any():
+                    print(f"CE survival rate: {np.nanmean(survival):.2%}")
                 else:
                     print(f"CE survival rate: N/A (no survival data)")
         
@@ -322,6 +531,8 @@ def main():
                        help='CE efficiency parameter (default: 1.0)')
     parser.add_argument('--output', type=str, default='CE_results.h5',
                        help='Output HDF5 file (default: CE_results.h5)')
+    parser.add_argument('--n_jobs', type=int, default=1,
+                       help='Worker processes for evolution, -1 for all cores (default: 1)')
     parser.add_argument('--quiet', action='store_true',
                        help='Suppress progress output')
     
@@ -356,10 +567,11 @@ def main():
     
     # Run population synthesis
     results_df = run_population(
-        binary_grid, 
-        args.output, 
+        binary_grid,
+        args.output,
         alpha_CE=args.alpha_CE,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        n_jobs=args.n_jobs
     )
     
     if not args.quiet: